@@ -6,13 +6,15 @@ from .authority_analyzer import (
     AuthorityAnalyzer,
     AuthorityLeak,
     AuthorityAnalysisResult,
+    leaks_to_dataframe,
     get_wrapper_distribution
 )
 
 from .facet_analyzer import (
     FacetAnalyzer,
     FacetStatus,
-    FacetAnalysisResult
+    FacetAnalysisResult,
+    facets_to_dataframe
 )
 
 from .scoring import (
@@ -20,6 +22,10 @@ from .scoring import (
     FacetScore,
     ScoringWeights,
     calculate_indexation_score,
+    calculate_indexation_scores,
+    scores_to_dataframe,
+    get_tier_summary,
+    get_priority_actions,
     generate_scoring_report
 )
 
@@ -28,17 +34,23 @@ __all__ = [
     'AuthorityAnalyzer',
     'AuthorityLeak',
     'AuthorityAnalysisResult',
+    'leaks_to_dataframe',
     'get_wrapper_distribution',
     
     # Facet
     'FacetAnalyzer',
     'FacetStatus',
     'FacetAnalysisResult',
+    'facets_to_dataframe',
     
     # Scoring
     'FacetScorer',
     'FacetScore',
     'ScoringWeights',
     'calculate_indexation_score',
+    'calculate_indexation_scores',
+    'scores_to_dataframe',
+    'get_tier_summary',
+    'get_priority_actions',
     'generate_scoring_report',
 ]
@@ -10,8 +10,16 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import re
 
+from data.pattern_matching import match_pattern
 
-@dataclass
+# Columnas de Adobe que usa el análisis (URL candidata y tráfico)
+ADOBE_URL_COLUMNS = ['url_full', 'url', 'url_clean', 'visits_seo']
+
+# Columnas de la tabla de fugas (mismo orden que AuthorityLeak.to_dict)
+LEAK_COLUMNS = ['url', 'traffic_seo', 'wrapper_links', 'leak_type', 'severity', 'recommendation']
+
+
+@dataclass(slots=True)
 class AuthorityLeak:
     """Representa una fuga de autoridad detectada"""
     url: str
@@ -54,12 +62,17 @@ class AuthorityAnalyzer:
             crawl_df: Crawl con wrapper_link_count calculado
             adobe_urls_df: Tráfico SEO por URL (opcional)
         """
-        self.crawl = crawl_df.copy()
-        self.adobe_urls = adobe_urls_df.copy() if adobe_urls_df is not None else pd.DataFrame()
-        
         # Detectar columnas
-        self.url_col = 'Dirección' if 'Dirección' in self.crawl.columns else 'url'
-        self.status_col = 'Código de respuesta' if 'Código de respuesta' in self.crawl.columns else 'status_code'
+        self.url_col = 'Dirección' if 'Dirección' in crawl_df.columns else 'url'
+        self.status_col = 'Código de respuesta' if 'Código de respuesta' in crawl_df.columns else 'status_code'
+        
+        # Solo se copian las columnas que usa el análisis, no el crawl entero
+        crawl_cols = [c for c in (self.url_col, self.status_col, 'wrapper_link_count') if c in crawl_df.columns]
+        self.crawl = crawl_df[crawl_cols].copy()
+        if adobe_urls_df is not None:
+            self.adobe_urls = adobe_urls_df[[c for c in ADOBE_URL_COLUMNS if c in adobe_urls_df.columns]].copy()
+        else:
+            self.adobe_urls = pd.DataFrame()
         
         # Asegurar que wrapper_link_count existe
         if 'wrapper_link_count' not in self.crawl.columns:
@@ -69,11 +82,10 @@ class AuthorityAnalyzer:
     
     def _merge_data(self) -> pd.DataFrame:
         """Combina crawl con tráfico"""
-        merged = self.crawl.copy()
+        merged = self.crawl
         
         if len(self.adobe_urls) == 0:
-            merged['visits_seo'] = 0
-            return merged
+            return merged.assign(visits_seo=0)
         
         # Detectar columna URL en adobe
         url_col_adobe = None
@@ -83,8 +95,7 @@ class AuthorityAnalyzer:
                 break
         
         if url_col_adobe is None:
-            merged['visits_seo'] = 0
-            return merged
+            return merged.assign(visits_seo=0)
         
         # Merge
         merged = merged.merge(
@@ -104,8 +115,8 @@ class AuthorityAnalyzer:
     def _get_urls_by_status(self, status_code: int) -> pd.DataFrame:
         """Obtiene URLs filtradas por código de estado"""
         if self.status_col in self.merged.columns:
-            return self.merged[self.merged[self.status_col] == status_code].copy()
-        return self.merged.copy()
+            return self.merged[self.merged[self.status_col] == status_code]
+        return self.merged
     
     def analyze_no_distribution(self, min_traffic: int = 100) -> List[AuthorityLeak]:
         """
@@ -118,19 +129,21 @@ class AuthorityAnalyzer:
             (urls_200['visits_seo'] >= min_traffic)
         ]
         
-        leaks = []
-        for _, row in no_dist.iterrows():
-            traffic = int(row['visits_seo'])
-            severity = 'high' if traffic > 5000 else ('medium' if traffic > 1000 else 'low')
-            
-            leaks.append(AuthorityLeak(
-                url=row[self.url_col],
-                traffic_seo=traffic,
+        # Severidad calculada por columnas; solo se crea un objeto por fuga
+        traffic = no_dist['visits_seo'].to_numpy().astype(np.int64)
+        severity = np.select([traffic > 5000, traffic > 1000], ['high', 'medium'], 'low')
+        
+        leaks = [
+            AuthorityLeak(
+                url=url,
+                traffic_seo=t,
                 wrapper_links=0,
                 leak_type='no_distribution',
-                severity=severity,
+                severity=sev,
                 recommendation="Añadir seoFilterWrapper con enlaces a facetas relevantes"
-            ))
+            )
+            for url, t, sev in zip(no_dist[self.url_col].tolist(), traffic.tolist(), severity.tolist())
+        ]
         
         return sorted(leaks, key=lambda x: x.traffic_seo, reverse=True)
     
@@ -145,21 +158,23 @@ class AuthorityAnalyzer:
             (urls_200['visits_seo'] < min_traffic)
         ]
         
-        leaks = []
-        for _, row in dilution.iterrows():
-            links = int(row['wrapper_link_count'])
-            traffic = int(row['visits_seo'])
-            ratio = links / max(traffic, 1)
-            severity = 'high' if ratio > 0.5 else ('medium' if ratio > 0.1 else 'low')
-            
-            leaks.append(AuthorityLeak(
-                url=row[self.url_col],
-                traffic_seo=traffic,
-                wrapper_links=links,
+        links = dilution['wrapper_link_count'].to_numpy().astype(np.int64)
+        traffic = dilution['visits_seo'].to_numpy().astype(np.int64)
+        ratio = links / np.maximum(traffic, 1)
+        severity = np.select([ratio > 0.5, ratio > 0.1], ['high', 'medium'], 'low')
+        
+        leaks = [
+            AuthorityLeak(
+                url=url,
+                traffic_seo=t,
+                wrapper_links=n,
                 leak_type='dilution',
-                severity=severity,
-                recommendation=f"Reducir de {links} a máximo {max_links} enlaces"
-            ))
+                severity=sev,
+                recommendation=f"Reducir de {n} a máximo {max_links} enlaces"
+            )
+            for url, n, t, sev in zip(dilution[self.url_col].tolist(), links.tolist(),
+                                      traffic.tolist(), severity.tolist())
+        ]
         
         return sorted(leaks, key=lambda x: x.wrapper_links, reverse=True)
     
@@ -202,9 +217,7 @@ class AuthorityAnalyzer:
         
         for facet, pattern in patterns.items():
             try:
-                count = len(urls_404[
-                    urls_404[self.url_col].str.contains(pattern, case=False, na=False, regex=True)
-                ])
+                count = int(np.count_nonzero(match_pattern(urls_404[self.url_col], pattern)))
                 if count > 0:
                     facet_counts[facet] = count
             except Exception:
@@ -263,23 +276,32 @@ class AuthorityAnalyzer:
         )
 
 
+def leaks_to_dataframe(leaks: List[AuthorityLeak]) -> pd.DataFrame:
+    """Tabla de fugas construida por columnas (sin un dict por fuga)"""
+    return pd.DataFrame({col: [getattr(l, col) for l in leaks] for col in LEAK_COLUMNS},
+                        columns=LEAK_COLUMNS)
+
+
 def get_wrapper_distribution(crawl_df: pd.DataFrame) -> pd.DataFrame:
     """Calcula distribución de enlaces en seoFilterWrapper"""
     status_col = 'Código de respuesta' if 'Código de respuesta' in crawl_df.columns else 'status_code'
     
-    if status_col in crawl_df.columns:
-        urls_200 = crawl_df[crawl_df[status_col] == 200]
-    else:
-        urls_200 = crawl_df
+    # Máscara sobre la columna de estado; no se filtra el crawl entero
+    is_200 = (crawl_df[status_col] == 200).to_numpy() if status_col in crawl_df.columns else None
+    
+    if 'wrapper_link_count' not in crawl_df.columns:
+        count = len(crawl_df) if is_200 is None else int(np.count_nonzero(is_200))
+        return pd.DataFrame({'range': ['N/A'], 'count': [count]})
     
-    if 'wrapper_link_count' not in urls_200.columns:
-        return pd.DataFrame({'range': ['N/A'], 'count': [len(urls_200)]})
+    link_counts = crawl_df['wrapper_link_count']
+    if is_200 is not None:
+        link_counts = link_counts[is_200]
     
     bins = [0, 1, 2, 3, 5, 10, 20, 50, 100, 1000]
     labels = ['0', '1', '2', '3-4', '5-9', '10-19', '20-49', '50-99', '100+']
     
     distribution = pd.cut(
-        urls_200['wrapper_link_count'].clip(upper=999),
+        link_counts.clip(upper=999),
         bins=bins,
         labels=labels,
         right=False
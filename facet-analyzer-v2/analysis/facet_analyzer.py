@@ -8,10 +8,21 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 from dataclasses import dataclass
-import re
 
+from data.pattern_matching import compile_pattern, match_pattern, aggregate_by_patterns
 
-@dataclass
+
+def _resolve_column(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
+    """Devuelve la primera columna candidata presente en el DataFrame"""
+    return next((c for c in candidates if c in df.columns), None)
+
+
+def _select_columns(df: pd.DataFrame, columns: List[Optional[str]]) -> pd.DataFrame:
+    """Copia de las columnas indicadas que existan (sin repetir y en ese orden)"""
+    return df[[c for c in dict.fromkeys(columns) if c is not None and c in df.columns]].copy()
+
+
+@dataclass(slots=True)
 class FacetStatus:
     """Estado de una faceta"""
     name: str
@@ -56,6 +67,20 @@ class FacetStatus:
         }
 
 
+# Columnas de la tabla de facetas (mismo orden que FacetStatus.to_dict)
+FACET_COLUMNS = [
+    'name', 'pattern', 'urls_200', 'urls_404', 'traffic_seo', 'demand_adobe',
+    'demand_keywords', 'in_wrapper', 'status', 'opportunity_score', 'confidence',
+    'recommendation',
+]
+
+
+def facets_to_dataframe(facets: List[FacetStatus]) -> pd.DataFrame:
+    """Tabla de facetas construida por columnas (sin un dict por faceta)"""
+    return pd.DataFrame({col: [getattr(f, col) for f in facets] for col in FACET_COLUMNS},
+                        columns=FACET_COLUMNS)
+
+
 @dataclass
 class FacetAnalysisResult:
     """Resultado del análisis de facetas"""
@@ -63,6 +88,13 @@ class FacetAnalysisResult:
     opportunities: List[FacetStatus]
     alerts: List[str]
     summary: str
+    table: Optional[pd.DataFrame] = None  # Facetas por columnas, calculada una vez
+    
+    def get_table(self) -> pd.DataFrame:
+        """Tabla por columnas de las facetas (se construye si falta)"""
+        if self.table is None:
+            self.table = facets_to_dataframe(self.facets)
+        return self.table
 
 
 class FacetAnalyzer:
@@ -84,17 +116,31 @@ class FacetAnalyzer:
             facet_mappings: Lista de FacetMapping desde data_config
             base_url: URL base de la categoría para detección de homepage
         """
-        self.crawl = crawl_df.copy()
-        self.adobe_urls = adobe_urls_df.copy() if adobe_urls_df is not None else pd.DataFrame()
-        self.adobe_filters = adobe_filters_df.copy() if adobe_filters_df is not None else pd.DataFrame()
-        self.keywords = keywords_df.copy() if keywords_df is not None else pd.DataFrame()
+        adobe_urls_df = adobe_urls_df if adobe_urls_df is not None else pd.DataFrame()
+        adobe_filters_df = adobe_filters_df if adobe_filters_df is not None else pd.DataFrame()
+        keywords_df = keywords_df if keywords_df is not None else pd.DataFrame()
         self.facet_mappings = facet_mappings or []
         self.base_url = base_url
         
         # Detectar columnas
-        self.url_col = 'Dirección' if 'Dirección' in self.crawl.columns else 'url'
-        self.status_col = 'Código de respuesta' if 'Código de respuesta' in self.crawl.columns else 'status_code'
-        self.depth_col = 'Nivel de profundidad' if 'Nivel de profundidad' in self.crawl.columns else None
+        self.url_col = 'Dirección' if 'Dirección' in crawl_df.columns else 'url'
+        self.status_col = 'Código de respuesta' if 'Código de respuesta' in crawl_df.columns else 'status_code'
+        self.depth_col = 'Nivel de profundidad' if 'Nivel de profundidad' in crawl_df.columns else None
+        href_cols = [c for c in crawl_df.columns if 'seofilterwrapper_hrefs' in str(c).lower()]
+        
+        # Columnas de las fuentes de tráfico y demanda (None si no existen)
+        self.adobe_url_col = _resolve_column(adobe_urls_df, ['url', 'url_full', 'url_clean'])
+        self.adobe_traffic_col = _resolve_column(adobe_urls_df, ['visits_seo', 'visits'])
+        self.filter_col = _resolve_column(adobe_filters_df, ['filter_name'] + list(adobe_filters_df.columns[:1]))
+        self.filter_traffic_col = _resolve_column(adobe_filters_df, ['visits_seo', 'visits'])
+        self.kw_col = _resolve_column(keywords_df, ['keyword', 'Keyword'])
+        self.vol_col = _resolve_column(keywords_df, ['volume', 'Volume'])
+        
+        # Solo se copian las columnas que usa el análisis, no los DataFrames enteros
+        self.crawl = _select_columns(crawl_df, [self.url_col, self.status_col, self.depth_col] + href_cols)
+        self.adobe_urls = _select_columns(adobe_urls_df, [self.adobe_url_col, self.adobe_traffic_col])
+        self.adobe_filters = _select_columns(adobe_filters_df, [self.filter_col, self.filter_traffic_col])
+        self.keywords = _select_columns(keywords_df, [self.kw_col, self.vol_col])
         
         # Separar por código
         if self.status_col in self.crawl.columns:
@@ -106,6 +152,15 @@ class FacetAnalyzer:
         
         # Detectar homepage/página principal
         self.homepage = self._find_homepage()
+        
+        # Métricas precalculadas por (patrón, filtro Adobe, keyword)
+        self._aggregates: Optional[Dict[tuple, dict]] = None
+        
+        # Máscaras de coincidencia por (fuente, columna) -> patrón
+        self._mask_cache: Dict[tuple, Dict[str, np.ndarray]] = {}
+        
+        # Columnas numéricas como arrays por (fuente, columna)
+        self._values_cache: Dict[tuple, np.ndarray] = {}
     
     def _find_homepage(self) -> Optional[pd.Series]:
         """
@@ -145,6 +200,26 @@ class FacetAnalyzer:
         # Fallback: primera URL
         return self.urls_200.iloc[0] if len(self.urls_200) > 0 else None
     
+    def _mask_cache_for(self, source: str, col: str) -> Dict[str, np.ndarray]:
+        """Caché de máscaras por patrón para una columna de una fuente"""
+        return self._mask_cache.setdefault((source, col), {})
+    
+    def _pattern_mask(self, source: str, df: pd.DataFrame, col: str, pattern: str) -> np.ndarray:
+        """Máscara de coincidencias de un patrón (se calcula una vez por fuente y columna)"""
+        cache = self._mask_cache_for(source, col)
+        if pattern not in cache:
+            cache[pattern] = match_pattern(df[col], pattern)
+        return cache[pattern]
+    
+    def _column_values(self, source: str, df: pd.DataFrame, col: str) -> np.ndarray:
+        """Columna numérica como array float (NaN -> 0), calculada una vez por fuente"""
+        key = (source, col)
+        if key not in self._values_cache:
+            self._values_cache[key] = (
+                pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+            )
+        return self._values_cache[key]
+    
     def _count_urls_by_pattern(self, pattern: str, status_code: int = None) -> int:
         """Cuenta URLs que coinciden con un patrón"""
         try:
@@ -158,71 +233,49 @@ class FacetAnalyzer:
             if len(df) == 0:
                 return 0
             
-            return len(df[df[self.url_col].str.contains(pattern, case=False, na=False, regex=True)])
+            mask = self._pattern_mask('crawl', self.crawl, self.url_col, pattern)
+            if status_code in (200, 404) and self.status_col in self.crawl.columns:
+                mask = mask & (self.crawl[self.status_col] == status_code).to_numpy()
+            return int(np.count_nonzero(mask))
         except Exception:
             return 0
     
     def _get_traffic_by_pattern(self, pattern: str) -> int:
         """Obtiene tráfico SEO de URLs que coinciden con patrón"""
-        if len(self.adobe_urls) == 0:
-            return 0
-        
-        url_col = None
-        for col in ['url', 'url_full', 'url_clean']:
-            if col in self.adobe_urls.columns:
-                url_col = col
-                break
-        
-        traffic_col = 'visits_seo' if 'visits_seo' in self.adobe_urls.columns else 'visits'
-        
-        if url_col is None or traffic_col not in self.adobe_urls.columns:
+        if len(self.adobe_urls) == 0 or self.adobe_url_col is None or self.adobe_traffic_col is None:
             return 0
         
         try:
-            matching = self.adobe_urls[
-                self.adobe_urls[url_col].str.contains(pattern, case=False, na=False, regex=True)
-            ]
-            return int(matching[traffic_col].sum())
+            mask = self._pattern_mask('adobe_urls', self.adobe_urls, self.adobe_url_col, pattern)
+            values = self._column_values('adobe_urls', self.adobe_urls, self.adobe_traffic_col)
+            return int(values[mask].sum())
         except Exception:
             return 0
     
     def _get_demand_adobe(self, filter_prefix: str) -> int:
         """Obtiene demanda de filtros de Adobe"""
-        if len(self.adobe_filters) == 0 or not filter_prefix:
-            return 0
-        
-        filter_col = 'filter_name' if 'filter_name' in self.adobe_filters.columns else self.adobe_filters.columns[0]
-        traffic_col = 'visits_seo' if 'visits_seo' in self.adobe_filters.columns else 'visits'
-        
-        if traffic_col not in self.adobe_filters.columns:
+        if len(self.adobe_filters) == 0 or not filter_prefix or self.filter_traffic_col is None:
             return 0
         
         try:
-            matching = self.adobe_filters[
-                self.adobe_filters[filter_col].str.contains(filter_prefix, case=False, na=False)
-            ]
-            return int(matching[traffic_col].sum())
+            mask = self._pattern_mask('adobe_filters', self.adobe_filters, self.filter_col, filter_prefix)
+            values = self._column_values('adobe_filters', self.adobe_filters, self.filter_traffic_col)
+            return int(values[mask].sum())
         except Exception:
             return 0
     
     def _get_demand_keywords(self, keywords: List[str]) -> int:
         """Obtiene volumen de búsqueda de keywords"""
-        if len(self.keywords) == 0:
+        if len(self.keywords) == 0 or self.kw_col is None or self.vol_col is None:
             return 0
         
-        kw_col = 'keyword' if 'keyword' in self.keywords.columns else 'Keyword'
-        vol_col = 'volume' if 'volume' in self.keywords.columns else 'Volume'
-        
-        if kw_col not in self.keywords.columns or vol_col not in self.keywords.columns:
-            return 0
+        values = self._column_values('keywords', self.keywords, self.vol_col)
         
         total = 0
         for kw in keywords:
             try:
-                matching = self.keywords[
-                    self.keywords[kw_col].str.contains(kw, case=False, na=False)
-                ]
-                total += matching[vol_col].sum()
+                mask = self._pattern_mask('keywords', self.keywords, self.kw_col, kw)
+                total += values[mask].sum()
             except Exception:
                 pass
         
@@ -241,18 +294,94 @@ class FacetAnalyzer:
         if not href_cols:
             return False, 0
         
+        compiled = compile_pattern(pattern)
+        if compiled is None:
+            return False, 0
+        
         count = 0
         for col in href_cols:
             val = self.homepage.get(col)
             if pd.notna(val) and str(val).strip():
-                try:
-                    if re.search(pattern, str(val), re.IGNORECASE):
-                        count += 1
-                except Exception:
-                    continue
+                if compiled.search(str(val)):
+                    count += 1
         
         return count > 0, count
     
+    @staticmethod
+    def _aggregate_key(facet_mapping) -> tuple:
+        """Clave de las métricas precalculadas de una faceta"""
+        return (facet_mapping.pattern,
+                facet_mapping.adobe_filter_match,
+                facet_mapping.facet_name.lower().replace('_', ' '))
+    
+    def precompute_facet_aggregates(self) -> pd.DataFrame:
+        """
+        Calcula en bloque URLs, tráfico y demanda de todas las facetas
+        
+        Cada patrón se evalúa una sola vez por fuente y los totales se obtienen
+        con productos matriciales por bloques de filas, sin filtrar los DataFrames
+        por faceta ni materializar la matriz completa de coincidencias.
+        """
+        keys = [self._aggregate_key(m) for m in self.facet_mappings]
+        patterns = [k[0] for k in keys]
+        filters = [k[1] for k in keys]
+        keywords = [k[2] for k in keys]
+        n = len(keys)
+        
+        # URLs del crawl por código de respuesta
+        urls_200 = np.zeros(n, dtype=np.int64)
+        urls_404 = np.zeros(n, dtype=np.int64)
+        if len(self.crawl) > 0 and self.url_col in self.crawl.columns:
+            if self.status_col in self.crawl.columns:
+                status = self.crawl[self.status_col]
+                weights = {'200': (status == 200).to_numpy(dtype=np.float64),
+                           '404': (status == 404).to_numpy(dtype=np.float64)}
+            else:
+                weights = {'200': np.ones(len(self.crawl))}
+            counts = aggregate_by_patterns(self.crawl[self.url_col], patterns, weights)
+            urls_200 = counts['200']
+            urls_404 = counts.get('404', urls_404)
+        
+        # Tráfico SEO por URL
+        traffic = np.zeros(n)
+        if len(self.adobe_urls) > 0 and self.adobe_url_col and self.adobe_traffic_col:
+            values = self._column_values('adobe_urls', self.adobe_urls, self.adobe_traffic_col)
+            traffic = aggregate_by_patterns(
+                self.adobe_urls[self.adobe_url_col], patterns, {'traffic': values}
+            )['traffic']
+        
+        # Demanda de filtros Adobe (las facetas sin filtro no se evalúan: su demanda es 0)
+        demand_adobe = np.zeros(n)
+        with_filter = [i for i, f in enumerate(filters) if f]
+        if len(self.adobe_filters) > 0 and self.filter_traffic_col and with_filter:
+            values = self._column_values('adobe_filters', self.adobe_filters, self.filter_traffic_col)
+            demand_adobe[with_filter] = aggregate_by_patterns(
+                self.adobe_filters[self.filter_col], [filters[i] for i in with_filter], {'demand': values}
+            )['demand']
+        
+        # Volumen de keywords
+        demand_keywords = np.zeros(n)
+        if len(self.keywords) > 0 and self.kw_col and self.vol_col:
+            values = self._column_values('keywords', self.keywords, self.vol_col)
+            demand_keywords = aggregate_by_patterns(
+                self.keywords[self.kw_col], keywords, {'demand': values}
+            )['demand']
+        
+        aggregates = pd.DataFrame({
+            'facet_name': [m.facet_name for m in self.facet_mappings],
+            'pattern': patterns,
+            'urls_200': urls_200.astype(int),
+            'urls_404': urls_404.astype(int),
+            'traffic_seo': traffic.astype(np.int64),
+            'demand_adobe': demand_adobe.astype(np.int64),
+            'demand_keywords': demand_keywords.astype(np.int64),
+        })
+        
+        self._aggregates = {
+            key: row for key, row in zip(keys, aggregates.drop(columns=['facet_name', 'pattern']).to_dict('records'))
+        }
+        return aggregates
+    
     def _calculate_opportunity_score(self, facet_data: dict) -> float:
         """Calcula puntuación de oportunidad (0-100)"""
         score = 0
@@ -331,16 +460,25 @@ class FacetAnalyzer:
         pattern = facet_mapping.pattern
         adobe_filter = facet_mapping.adobe_filter_match
         
-        # Contar URLs
-        urls_200 = self._count_urls_by_pattern(pattern, 200)
-        urls_404 = self._count_urls_by_pattern(pattern, 404)
-        
-        # Tráfico
-        traffic_seo = self._get_traffic_by_pattern(pattern)
+        aggregates = (self._aggregates or {}).get(self._aggregate_key(facet_mapping))
         
-        # Demanda
-        demand_adobe = self._get_demand_adobe(adobe_filter) if adobe_filter else 0
-        demand_keywords = self._get_demand_keywords([name.lower().replace('_', ' ')])
+        if aggregates is not None:
+            urls_200 = aggregates['urls_200']
+            urls_404 = aggregates['urls_404']
+            traffic_seo = aggregates['traffic_seo']
+            demand_adobe = aggregates['demand_adobe']
+            demand_keywords = aggregates['demand_keywords']
+        else:
+            # Contar URLs
+            urls_200 = self._count_urls_by_pattern(pattern, 200)
+            urls_404 = self._count_urls_by_pattern(pattern, 404)
+            
+            # Tráfico
+            traffic_seo = self._get_traffic_by_pattern(pattern)
+            
+            # Demanda
+            demand_adobe = self._get_demand_adobe(adobe_filter) if adobe_filter else 0
+            demand_keywords = self._get_demand_keywords([name.lower().replace('_', ' ')])
         
         # seoFilterWrapper
         in_wrapper, wrapper_count = self._check_in_wrapper(pattern)
@@ -395,6 +533,13 @@ class FacetAnalyzer:
         opportunities = []
         alerts = []
         
+        if self._aggregates is None:
+            try:
+                self.precompute_facet_aggregates()
+            except Exception as e:
+                # Las facetas se analizan una a una (más lento), pero el fallo queda a la vista
+                alerts.append(f"⚠️ Error precalculando métricas de facetas: {str(e)}")
+        
         for mapping in self.facet_mappings:
             try:
                 facet = self.analyze_facet(mapping)
@@ -415,23 +560,26 @@ class FacetAnalyzer:
         # Ordenar por score
         opportunities = sorted(opportunities, key=lambda x: x.opportunity_score, reverse=True)
         
-        summary = self._generate_summary(facets, opportunities, alerts)
+        table = facets_to_dataframe(facets)
+        summary = self._generate_summary(table, opportunities, alerts)
         
         return FacetAnalysisResult(
             facets=facets,
             opportunities=opportunities,
             alerts=alerts,
-            summary=summary
+            summary=summary,
+            table=table
         )
     
-    def _generate_summary(self, facets: List[FacetStatus],
+    def _generate_summary(self, table: pd.DataFrame,
                           opportunities: List[FacetStatus],
                           alerts: List[str]) -> str:
         """Genera resumen del análisis"""
-        active = sum(1 for f in facets if f.status == 'active')
-        partial = sum(1 for f in facets if f.status == 'partial')
-        eliminated = sum(1 for f in facets if f.status == 'eliminated')
-        missing = sum(1 for f in facets if f.status == 'missing')
+        status_counts = table['status'].value_counts()
+        active = int(status_counts.get('active', 0))
+        partial = int(status_counts.get('partial', 0))
+        eliminated = int(status_counts.get('eliminated', 0))
+        missing = int(status_counts.get('missing', 0))
         
         summary = f"""
 ## Resumen de Facetas
@@ -5,11 +5,18 @@ Genérico y configurable para cualquier categoría de productos
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
+from enum import IntEnum
 
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
-@dataclass
+
+@dataclass(slots=True)
 class ScoringWeights:
     """Pesos configurables para el scoring"""
     demand_weight: float = 0.35
@@ -32,9 +39,54 @@ class ScoringWeights:
             self.performance_weight /= total
             self.coverage_weight /= total
             self.opportunity_weight /= total
+    
+    def as_vector(self) -> np.ndarray:
+        """Pesos como array en el orden (demanda, rendimiento, cobertura, oportunidad)"""
+        return np.array([self.demand_weight, self.performance_weight,
+                         self.coverage_weight, self.opportunity_weight], dtype=np.float64)
+
+
+# Campos de FacetScore en orden de salida, y los que se redondean al mostrar
+SCORE_FIELDS = (
+    'facet_name', 'demand_score', 'performance_score', 'coverage_score',
+    'opportunity_score', 'total_score', 'demand_value', 'traffic_value',
+    'urls_200', 'urls_404', 'in_wrapper', 'tier', 'recommendation', 'confidence',
+)
+SCORE_COLUMNS = ['demand_score', 'performance_score', 'coverage_score',
+                 'opportunity_score', 'total_score']
+COUNT_COLUMNS = ['demand_value', 'traffic_value', 'urls_200', 'urls_404']
+
+
+class Threshold(IntEnum):
+    """Posición de cada umbral en el array de umbrales del scorer (nombre = clave en minúsculas)"""
+    DEMAND_LOW = 0
+    DEMAND_MEDIUM = 1
+    DEMAND_HIGH = 2
+    DEMAND_VERY_HIGH = 3
+    TRAFFIC_LOW = 4
+    TRAFFIC_MEDIUM = 5
+    TRAFFIC_HIGH = 6
+    TRAFFIC_VERY_HIGH = 7
+    URLS_FEW = 8
+    URLS_SOME = 9
+    URLS_MANY = 10
+
 
+# Tiers de mayor a menor prioridad
+TIER_ORDER = ['S', 'A', 'B', 'C', 'D']
 
-@dataclass
+# Entradas de scoring y su valor si faltan
+FACET_INPUT_DEFAULTS = {
+    'facet_name': 'Unknown',
+    'demand': 0,
+    'traffic': 0,
+    'urls_200': 0,
+    'urls_404': 0,
+    'in_wrapper': False,
+}
+
+
+@dataclass(slots=True)
 class FacetScore:
     """Puntuación detallada de una faceta"""
     facet_name: str
@@ -79,6 +131,10 @@ class FacetScore:
         }
 
 
+# Scores como lista de FacetScore o como DataFrame de score_table / score_facets
+ScoreList = Union[List[FacetScore], pd.DataFrame]
+
+
 class FacetScorer:
     """
     Sistema de puntuación de facetas genérico
@@ -108,6 +164,19 @@ class FacetScorer:
         0: 'D',
     }
     
+    # Recomendaciones por tier y situación de la faceta
+    RECOMMENDATIONS = {
+        'S_wrapper': "⭐ Faceta estrella. Mantener posición prominente en seoFilterWrapper.",
+        'S_no_wrapper': "🚀 Alta prioridad: Añadir inmediatamente a seoFilterWrapper.",
+        'A_wrapper': "✅ Buen rendimiento. Optimizar contenido de páginas de filtro.",
+        'A_no_wrapper': "📈 Añadir a seoFilterWrapper para capturar demanda existente.",
+        'B_urls': "🔍 Monitorear rendimiento. Evaluar inclusión si mejora demanda.",
+        'B_no_urls': "⚠️ Hay demanda pero sin URLs. Evaluar crear páginas de filtro.",
+        'C_removed': "🔴 Muchas URLs eliminadas. Evaluar si recuperar o redireccionar.",
+        'C_low': "📊 Baja prioridad. Monitorear tendencias de demanda.",
+        'D': "⏸️ Sin acción requerida. Demanda insuficiente.",
+    }
+    
     def __init__(self, 
                  weights: ScoringWeights = None,
                  thresholds: Dict = None):
@@ -118,13 +187,75 @@ class FacetScorer:
         """
         self.weights = weights or ScoringWeights()
         self.weights.normalize()
+        self._weight_vec = self.weights.as_vector()
         
         self.thresholds = {**self.DEFAULT_THRESHOLDS}
         if thresholds:
             self.thresholds.update(thresholds)
+        
+        self._build_bands()
+    
+    # Puntos por banda (de menor a mayor umbral)
+    _VOLUME_BAND_SCORES = np.array([20.0, 40.0, 60.0, 80.0, 100.0])
+    _URLS_BAND_SCORES = np.array([0.0, 40.0, 70.0, 100.0])
+    
+    # Oportunidad por fracción de demanda capturada (< 10%, < 30%, < 50%, resto)
+    _OPPORTUNITY_RATIO_CUTS = np.array([0.1, 0.3, 0.5])
+    _OPPORTUNITY_BAND_SCORES = np.array([80.0, 60.0, 40.0, 20.0])
+    
+    # Confianza según el número de fuentes con datos (0-3)
+    _CONFIDENCE_BY_SOURCES = np.array(['low', 'low', 'medium', 'high'], dtype=object)
+    
+    def _build_bands(self):
+        """Precalcula los arrays de umbrales para el scoring vectorizado"""
+        self._th = np.array([self.thresholds[t.name.lower()] for t in Threshold], dtype=np.float64)
+        
+        # Bandas de cada métrica como vistas ascendentes sobre _th
+        self._demand_bins = self._th[Threshold.DEMAND_LOW:Threshold.DEMAND_VERY_HIGH + 1]
+        self._traffic_bins = self._th[Threshold.TRAFFIC_LOW:Threshold.TRAFFIC_VERY_HIGH + 1]
+        self._urls_bins = self._th[Threshold.URLS_FEW:Threshold.URLS_MANY + 1]
+        
+        # Tiers: umbrales ascendentes; la posición 0 de las etiquetas es "por debajo de todos"
+        cuts = sorted(self.TIERS)
+        self._tier_cuts = np.array(cuts, dtype=np.float64)
+        self._tier_labels = np.array(['D'] + [self.TIERS[c] for c in cuts], dtype=object)
+        
+        # Categorías ordenadas de menor a mayor tier y código de cada posición de _tier_labels
+        self._tier_categories = list(dict.fromkeys(self._tier_labels))
+        self._tier_label_codes = np.array([self._tier_categories.index(t) for t in self._tier_labels],
+                                          dtype=np.int8)
+        
+        # Recomendaciones por código de estado: tier*8 + wrapper*4 + urls*2 + más 404
+        self._recommendation_table = np.array([
+            self.RECOMMENDATIONS[self._recommendation_key(tier, in_wrapper, has_urls, more_404)]
+            for tier in self._tier_categories
+            for in_wrapper in (False, True)
+            for has_urls in (False, True)
+            for more_404 in (False, True)
+        ], dtype=object)
+    
+    def _score_volume_vec(self, values, bins: np.ndarray) -> np.ndarray:
+        """Asigna la banda de volumen a un array completo (0 si el valor es <= 0)"""
+        v = np.asarray(values, dtype=np.float64)
+        scores = self._VOLUME_BAND_SCORES[np.searchsorted(bins, v, side='right')]
+        return np.where(v > 0, scores, 0.0)
+    
+    def _score_demand_vec(self, demand) -> np.ndarray:
+        """Versión vectorizada de _score_demand"""
+        return self._score_volume_vec(demand, self._demand_bins)
+    
+    def _score_performance_vec(self, traffic, urls_200) -> np.ndarray:
+        """Versión vectorizada de _score_performance"""
+        traffic_score = self._score_volume_vec(traffic, self._traffic_bins)
+        urls = np.asarray(urls_200, dtype=np.float64)
+        urls_score = self._URLS_BAND_SCORES[np.searchsorted(self._urls_bins, urls, side='right')]
+        return traffic_score * 0.7 + urls_score * 0.3
     
     def _score_demand(self, demand: int) -> float:
         """Calcula score de demanda (0-100)"""
+        if demand <= 0:
+            return 0
+        
         if demand >= self.thresholds['demand_very_high']:
             return 100
         elif demand >= self.thresholds['demand_high']:
@@ -140,7 +271,9 @@ class FacetScorer:
     def _score_performance(self, traffic: int, urls_200: int) -> float:
         """Calcula score de rendimiento (0-100)"""
         # Score por tráfico (70%)
-        if traffic >= self.thresholds['traffic_very_high']:
+        if traffic <= 0:
+            traffic_score = 0
+        elif traffic >= self.thresholds['traffic_very_high']:
             traffic_score = 100
         elif traffic >= self.thresholds['traffic_high']:
             traffic_score = 80
@@ -191,20 +324,34 @@ class FacetScorer:
         
         return ratio_score * 0.5 + wrapper_score * 0.3 + penalty_score * 0.2
     
+    def _score_coverage_vec(self, urls_200, urls_404, in_wrapper) -> np.ndarray:
+        """Versión vectorizada de _score_coverage"""
+        urls_200 = np.asarray(urls_200, dtype=np.float64)
+        urls_404 = np.asarray(urls_404, dtype=np.float64)
+        total_urls = urls_200 + urls_404
+        
+        active_ratio = np.divide(urls_200, total_urls, out=np.zeros_like(total_urls), where=total_urls != 0)
+        wrapper_score = np.where(np.asarray(in_wrapper, dtype=bool), 100.0, 0.0)
+        penalty_score = np.select([urls_404 == 0, urls_404 < 10, urls_404 < 50], [100.0, 80.0, 50.0], 20.0)
+        
+        coverage = active_ratio * 100 * 0.5 + wrapper_score * 0.3 + penalty_score * 0.2
+        return np.where(total_urls == 0, 0.0, coverage)
+    
     def _score_opportunity(self, demand: int, traffic: int, in_wrapper: bool, urls_200: int) -> float:
         """Calcula score de oportunidad (0-100)"""
         # Alta demanda + bajo tráfico = alta oportunidad
         if demand == 0:
             return 0
         
-        # Potencial sin explotar
+        # Potencial sin explotar: fracción de la demanda ya capturada como tráfico
+        captured = traffic / demand if demand > 0 else float('inf')
         if traffic == 0 and demand > self.thresholds['demand_medium']:
             base_score = 90
-        elif traffic < demand * 0.1:  # Menos del 10% capturado
+        elif captured < 0.1:  # Menos del 10% capturado
             base_score = 80
-        elif traffic < demand * 0.3:
+        elif captured < 0.3:
             base_score = 60
-        elif traffic < demand * 0.5:
+        elif captured < 0.5:
             base_score = 40
         else:
             base_score = 20
@@ -215,41 +362,79 @@ class FacetScorer:
         
         return base_score
     
+    def _weighted_total(self, sub_scores) -> np.ndarray:
+        """
+        Score total ponderado de uno o varios vectores de scores parciales
+        
+        Multiplica y suma por columnas en el mismo orden que la suma escalar
+        para que el resultado sea idéntico bit a bit (np.dot puede reordenar).
+        """
+        return (np.asarray(sub_scores, dtype=np.float64) * self._weight_vec).sum(axis=-1)
+    
+    def _score_opportunity_vec(self, demand, traffic, in_wrapper, urls_200) -> np.ndarray:
+        """Versión vectorizada de _score_opportunity"""
+        demand = np.asarray(demand, dtype=np.float64)
+        traffic = np.asarray(traffic, dtype=np.float64)
+        
+        captured = np.divide(traffic, demand, out=np.full_like(demand, np.inf), where=demand > 0)
+        base_score = self._OPPORTUNITY_BAND_SCORES[
+            np.searchsorted(self._OPPORTUNITY_RATIO_CUTS, captured, side='right')
+        ]
+        base_score = np.where((traffic == 0) & (demand > self._th[Threshold.DEMAND_MEDIUM]),
+                              90.0, base_score)
+        
+        bonus = ~np.asarray(in_wrapper, dtype=bool) & (np.asarray(urls_200) > 0)
+        base_score = np.where(bonus, np.minimum(100.0, base_score + 20), base_score)
+        
+        return np.where(demand == 0, 0.0, base_score)
+    
     def _get_tier(self, score: float) -> str:
         """Determina el tier basado en el score"""
-        for threshold, tier in sorted(self.TIERS.items(), reverse=True):
-            if score >= threshold:
-                return tier
+        return str(self._get_tier_vec(score))
+    
+    def _get_tier_vec(self, scores) -> np.ndarray:
+        """Versión vectorizada de _get_tier (búsqueda binaria sobre los umbrales)"""
+        return self._tier_labels[self._tier_positions(scores)]
+    
+    def _tier_positions(self, scores) -> np.ndarray:
+        """Posición en _tier_labels de cada score (0 si está por debajo de todo o es NaN)"""
+        scores = np.asarray(scores, dtype=np.float64)
+        idx = np.searchsorted(self._tier_cuts, scores, side='right')
+        return np.where(np.isnan(scores), 0, idx)
+    
+    def _get_tier_categorical(self, scores) -> pd.Categorical:
+        """Tiers como Categorical ordenado (D < C < B < A < S) a partir de los códigos"""
+        codes = self._tier_label_codes[self._tier_positions(scores)]
+        return pd.Categorical.from_codes(codes, categories=self._tier_categories, ordered=True)
+    
+    @staticmethod
+    def _recommendation_key(tier: str, in_wrapper: bool, has_urls: bool, more_404: bool) -> str:
+        """Clave de RECOMMENDATIONS según tier y situación de la faceta"""
+        if tier == 'S':
+            return 'S_wrapper' if in_wrapper else 'S_no_wrapper'
+        elif tier == 'A':
+            return 'A_wrapper' if in_wrapper else 'A_no_wrapper'
+        elif tier == 'B':
+            return 'B_urls' if has_urls else 'B_no_urls'
+        elif tier == 'C':
+            return 'C_removed' if more_404 else 'C_low'
         return 'D'
     
     def _generate_recommendation(self, score: FacetScore) -> str:
         """Genera recomendación basada en el análisis"""
-        if score.tier == 'S':
-            if score.in_wrapper:
-                return "⭐ Faceta estrella. Mantener posición prominente en seoFilterWrapper."
-            else:
-                return "🚀 Alta prioridad: Añadir inmediatamente a seoFilterWrapper."
-        
-        elif score.tier == 'A':
-            if score.in_wrapper:
-                return "✅ Buen rendimiento. Optimizar contenido de páginas de filtro."
-            else:
-                return "📈 Añadir a seoFilterWrapper para capturar demanda existente."
-        
-        elif score.tier == 'B':
-            if score.urls_200 > 0:
-                return "🔍 Monitorear rendimiento. Evaluar inclusión si mejora demanda."
-            else:
-                return "⚠️ Hay demanda pero sin URLs. Evaluar crear páginas de filtro."
-        
-        elif score.tier == 'C':
-            if score.urls_404 > score.urls_200:
-                return "🔴 Muchas URLs eliminadas. Evaluar si recuperar o redireccionar."
-            else:
-                return "📊 Baja prioridad. Monitorear tendencias de demanda."
-        
-        else:  # D
-            return "⏸️ Sin acción requerida. Demanda insuficiente."
+        return self.RECOMMENDATIONS[self._recommendation_key(
+            score.tier, score.in_wrapper, score.urls_200 > 0, score.urls_404 > score.urls_200
+        )]
+    
+    def _generate_recommendation_vec(self, tiers: pd.Categorical, in_wrapper, urls_200, urls_404) -> np.ndarray:
+        """Versión vectorizada de _generate_recommendation (índice en la tabla precalculada)"""
+        urls_200 = np.asarray(urls_200)
+        
+        state = (tiers.codes.astype(np.intp) * 8 +
+                 np.asarray(in_wrapper, dtype=bool) * 4 +
+                 (urls_200 > 0) * 2 +
+                 (np.asarray(urls_404) > urls_200))
+        return self._recommendation_table[state]
     
     def _determine_confidence(self, demand: int, traffic: int, urls_200: int) -> str:
         """Determina nivel de confianza del análisis"""
@@ -268,6 +453,13 @@ class FacetScorer:
             return 'medium'
         return 'low'
     
+    def _determine_confidence_vec(self, demand, traffic, urls_200) -> np.ndarray:
+        """Versión vectorizada de _determine_confidence"""
+        sources = ((np.asarray(demand) > self._th[Threshold.DEMAND_LOW]).astype(np.int8) +
+                   (np.asarray(traffic) > self._th[Threshold.TRAFFIC_LOW]) +
+                   (np.asarray(urls_200) > 0))
+        return self._CONFIDENCE_BY_SOURCES[sources]
+    
     def score_facet(self, 
                     facet_name: str,
                     demand: int = 0,
@@ -285,12 +477,9 @@ class FacetScorer:
         opportunity_score = self._score_opportunity(demand, traffic, in_wrapper, urls_200)
         
         # Score total ponderado
-        total_score = (
-            demand_score * self.weights.demand_weight +
-            performance_score * self.weights.performance_weight +
-            coverage_score * self.weights.coverage_weight +
-            opportunity_score * self.weights.opportunity_weight
-        )
+        total_score = float(self._weighted_total(
+            [demand_score, performance_score, coverage_score, opportunity_score]
+        ))
         
         # Crear objeto de score
         score = FacetScore(
@@ -321,55 +510,214 @@ class FacetScorer:
             facets_data: Lista de dicts con keys:
                 - facet_name, demand, traffic, urls_200, urls_404, in_wrapper
         """
-        scores = []
-        for data in facets_data:
-            score = self.score_facet(
-                facet_name=data.get('facet_name', 'Unknown'),
-                demand=data.get('demand', 0),
-                traffic=data.get('traffic', 0),
-                urls_200=data.get('urls_200', 0),
-                urls_404=data.get('urls_404', 0),
-                in_wrapper=data.get('in_wrapper', False),
-            )
-            scores.append(score)
-        
-        return sorted(scores, key=lambda x: x.total_score, reverse=True)
-    
-    def to_dataframe(self, scores: List[FacetScore]) -> pd.DataFrame:
-        """Convierte lista de scores a DataFrame"""
-        data = [s.to_dict() for s in scores]
-        return pd.DataFrame(data)
-    
-    def get_tier_summary(self, scores: List[FacetScore]) -> Dict[str, int]:
-        """Resumen de facetas por tier"""
-        summary = {'S': 0, 'A': 0, 'B': 0, 'C': 0, 'D': 0}
-        for score in scores:
-            if score.tier in summary:
-                summary[score.tier] += 1
-        return summary
+        if not len(facets_data):
+            return []
+        
+        table = self.score_table(facets_data)
+        columns = [table[name].tolist() for name in SCORE_FIELDS]
+        return [FacetScore(*values) for values in zip(*columns)]
     
-    def get_priority_actions(self, scores: List[FacetScore], top_n: int = 10) -> List[Dict]:
-        """Obtiene las acciones prioritarias"""
-        actions = []
+    def score_table(self, facets_data: Union[List[Dict], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Como score_multiple, pero devuelve un DataFrame (una columna por campo
+        de FacetScore) ordenado por total_score descendente
+        """
+        if isinstance(facets_data, pd.DataFrame):
+            facets_df = facets_data
+        else:
+            facets_df = pd.DataFrame({
+                key: [data.get(key, default) for data in facets_data]
+                for key, default in FACET_INPUT_DEFAULTS.items()
+            })
+        scored = self.score_facets(facets_df)
         
-        # Priorizar: alto score + no en wrapper + URLs disponibles
-        priority_scores = sorted(
-            [s for s in scores if not s.in_wrapper and s.urls_200 > 0],
-            key=lambda x: x.total_score,
-            reverse=True
-        )
+        # Orden descendente estable, como sorted(..., reverse=True)
+        order = np.argsort(-scored['total_score'].to_numpy(), kind='stable')
+        return scored.iloc[order].reset_index(drop=True)
+    
+    def score_facets(self, facets_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcula scores de muchas facetas a la vez, operando por columnas
         
-        for score in priority_scores[:top_n]:
-            actions.append({
-                'facet': score.facet_name,
-                'action': 'ADD_TO_WRAPPER',
-                'priority': score.tier,
-                'score': score.total_score,
-                'potential_traffic': score.demand_value,
-                'urls_available': score.urls_200,
-            })
+        Args:
+            facets_df: DataFrame con columnas facet_name, demand, traffic,
+                urls_200, urls_404, in_wrapper (las que falten valen 0/False)
         
-        return actions
+        Returns:
+            DataFrame con los campos de FacetScore, en el orden de entrada
+        """
+        n = len(facets_df)
+        
+        def numeric(col: str) -> np.ndarray:
+            if col not in facets_df.columns:
+                return np.zeros(n, dtype=np.int64)
+            return pd.to_numeric(facets_df[col], errors='coerce').fillna(0).to_numpy()
+        
+        names = facets_df['facet_name'] if 'facet_name' in facets_df.columns else pd.Series(['Unknown'] * n)
+        demand = numeric('demand')
+        traffic = numeric('traffic')
+        urls_200 = numeric('urls_200')
+        urls_404 = numeric('urls_404')
+        if 'in_wrapper' in facets_df.columns:
+            in_wrapper = facets_df['in_wrapper'].fillna(False).astype(bool).to_numpy()
+        else:
+            in_wrapper = np.zeros(n, dtype=bool)
+        
+        # Scores parciales
+        sub_scores = np.column_stack([
+            self._score_demand_vec(demand),
+            self._score_performance_vec(traffic, urls_200),
+            self._score_coverage_vec(urls_200, urls_404, in_wrapper),
+            self._score_opportunity_vec(demand, traffic, in_wrapper, urls_200),
+        ]) if n else np.zeros((0, 4))
+        
+        total_score = self._weighted_total(sub_scores)
+        tiers = self._get_tier_categorical(total_score)
+        
+        # Demanda y oportunidad son bandas discretas: enteros, como en score_facet
+        return pd.DataFrame({
+            'facet_name': names.to_numpy(),
+            'demand_score': sub_scores[:, 0].astype(np.int64),
+            'performance_score': sub_scores[:, 1],
+            'coverage_score': sub_scores[:, 2],
+            'opportunity_score': sub_scores[:, 3].astype(np.int64),
+            'total_score': total_score,
+            'demand_value': demand,
+            'traffic_value': traffic,
+            'urls_200': urls_200,
+            'urls_404': urls_404,
+            'in_wrapper': in_wrapper,
+            'tier': tiers,
+            'recommendation': self._generate_recommendation_vec(tiers, in_wrapper, urls_200, urls_404),
+            'confidence': self._determine_confidence_vec(demand, traffic, urls_200),
+        })
+    
+    def to_dataframe(self, scores: ScoreList) -> pd.DataFrame:
+        """Convierte los scores a DataFrame (redondeo en bloque al final)"""
+        return scores_to_dataframe(scores)
+    
+    def get_tier_summary(self, scores: ScoreList) -> Dict[str, int]:
+        """Resumen de facetas por tier"""
+        return get_tier_summary(scores)
+    
+    def get_priority_actions(self, scores: ScoreList, top_n: int = 10) -> List[Dict]:
+        """Obtiene las acciones prioritarias"""
+        return get_priority_actions(scores, top_n)
+
+
+def scores_to_dataframe(scores: ScoreList) -> pd.DataFrame:
+    """Convierte los scores a DataFrame (redondeo en bloque al final)"""
+    if not len(scores):
+        return pd.DataFrame()
+    
+    # Una sola pasada: assign devuelve un DataFrame nuevo sin tocar la tabla original
+    table = _score_frame(scores)
+    df = table.assign(**{col: _round_scores(table[col].to_numpy(), 1) for col in SCORE_COLUMNS})
+    
+    # Conteos al entero más pequeño que los contiene (sin pérdida)
+    for col in COUNT_COLUMNS:
+        if df[col].dtype.kind in 'iu':
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    return _with_arrow_dtypes(df) if HAS_PYARROW else df
+
+
+def get_tier_summary(scores: ScoreList) -> Dict[str, int]:
+    """Resumen de facetas por tier"""
+    codes = pd.Categorical(_score_frame(scores)['tier'], categories=TIER_ORDER).codes
+    counts = np.bincount(codes[codes >= 0], minlength=len(TIER_ORDER))
+    return {tier: int(count) for tier, count in zip(TIER_ORDER, counts)}
+
+
+def get_priority_actions(scores: ScoreList, top_n: int = 10) -> List[Dict]:
+    """Obtiene las acciones prioritarias"""
+    table = _score_frame(scores)
+    
+    # Priorizar: alto score + no en wrapper + URLs disponibles
+    eligible = np.flatnonzero(
+        ~table['in_wrapper'].to_numpy(dtype=bool) & (table['urls_200'].to_numpy() > 0)
+    )
+    totals = table['total_score'].to_numpy(dtype=np.float64)[eligible]
+    
+    if _is_descending(totals):
+        # Ya ordenado (score_table / score_multiple): basta con cortar
+        order = np.arange(len(eligible))[:top_n]
+    else:
+        if 0 < top_n < len(eligible):
+            # Selección O(N) de candidatos (empates en el corte incluidos) y orden solo de esos
+            kth = np.partition(-totals, top_n - 1)[top_n - 1]
+            candidates = np.flatnonzero(-totals <= kth)
+        else:
+            candidates = np.arange(len(eligible))
+        order = candidates[np.argsort(-totals[candidates], kind='stable')][:top_n]
+    top = table.iloc[eligible[order]]
+    
+    return [
+        {
+            'facet': score.facet_name,
+            'action': 'ADD_TO_WRAPPER',
+            'priority': score.tier,
+            'score': score.total_score,
+            'potential_traffic': score.demand_value,
+            'urls_available': score.urls_200,
+        }
+        for score in top.itertuples(index=False)
+    ]
+
+
+def _with_arrow_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pasa las columnas a tipos Arrow sin cambiar valores (el tier sigue siendo categórico)
+    
+    Los números conservan su tipo NumPy (no se infieren enteros a partir de floats):
+    to_csv escribe lo mismo que con la tabla NumPy (ver tests/test_scoring.py)
+    """
+    dtypes = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            continue
+        if dtype.kind in 'biuf':
+            dtypes[col] = pd.ArrowDtype(pa.from_numpy_dtype(dtype))
+        elif pd.api.types.is_string_dtype(dtype):
+            dtypes[col] = pd.ArrowDtype(pa.string())
+    try:
+        return df.astype(dtypes)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        return df
+
+
+def _round_scores(values: np.ndarray, decimals: int) -> np.ndarray:
+    """
+    Redondeo vectorizado con el mismo resultado que round() de Python
+    
+    np.round escala por 10**decimals y falla en valores al borde del medio
+    (71.55 -> 71.6, round() da 71.5); esos pocos se redondean con round()
+    """
+    if values.dtype.kind in 'iu':
+        return values
+    
+    rounded = np.round(values, decimals)
+    scaled = values * 10 ** decimals
+    near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-9
+    if near_half.any():
+        rounded[near_half] = [round(v, decimals) for v in values[near_half].tolist()]
+    return rounded
+
+
+def _is_descending(totals: np.ndarray) -> bool:
+    """True si los scores ya vienen en orden descendente (ordenarlos no cambiaría nada)"""
+    return bool(np.all(totals[:-1] >= totals[1:]))
+
+
+def _score_frame(scores: ScoreList) -> pd.DataFrame:
+    """Scores como DataFrame de columnas de FacetScore (sin copiar si ya lo es)"""
+    if isinstance(scores, pd.DataFrame):
+        return scores
+    return pd.DataFrame({
+        name: [getattr(s, name) for s in scores]
+        for name in SCORE_FIELDS
+    })
 
 
 def calculate_indexation_score(
@@ -450,10 +798,89 @@ def calculate_indexation_score(
     return score, decision, explanation
 
 
-def generate_scoring_report(scores: List[FacetScore], family_name: str = "") -> str:
+# Puntos y etiqueta de cada banda de calculate_indexation_score, de mayor a menor
+_INDEXATION_BANDS = {
+    'gsc_clicks': ([40, 30, 20, 10],
+                   ["Clicks altos ({:,})", "Clicks medios ({:,})",
+                    "Clicks bajos ({:,})", "Algunos clicks ({:,})"]),
+    'gsc_position': ([20, 15, 10],
+                     ["Posición top 10 ({:.1f})", "Posición top 20 ({:.1f})",
+                      "Posición media ({:.1f})"]),
+    'adobe_traffic': ([20, 15, 10],
+                      ["Tráfico alto ({:,})", "Tráfico medio ({:,})", "Tráfico bajo ({:,})"]),
+    'demand_volume': ([20, 15, 10],
+                      ["Demanda muy alta ({:,})", "Demanda alta ({:,})", "Demanda media ({:,})"]),
+}
+
+_INDEXATION_PREFIXES = {
+    'INDEX': "Alta prioridad de indexación. Factores: ",
+    'EVALUATE': "Evaluar caso por caso. Factores: ",
+    'NOINDEX': "Baja prioridad. Factores: ",
+}
+
+
+def calculate_indexation_scores(data, explain: bool = True) -> pd.DataFrame:
+    """
+    Versión por lotes de calculate_indexation_score
+    
+    Args:
+        data: DataFrame o dict de arrays con columnas gsc_clicks, gsc_impressions,
+            gsc_position, adobe_traffic, demand_volume, urls_count (las que falten valen 0)
+        explain: Si es False no se construye la columna explanation
+    
+    Returns:
+        DataFrame con score, decision y explanation, en el orden de entrada
+    """
+    df = pd.DataFrame(data)
+    n = len(df)
+    
+    def column(name: str) -> np.ndarray:
+        if name not in df.columns:
+            return np.zeros(n, dtype=np.int64)
+        return pd.to_numeric(df[name], errors='coerce').fillna(0).to_numpy()
+    
+    clicks = column('gsc_clicks')
+    position = column('gsc_position')
+    traffic = column('adobe_traffic')
+    demand = column('demand_volume')
+    
+    # Banda de cada factor (1 = la más alta, 0 = sin puntos)
+    bands = {
+        'gsc_clicks': (clicks, [clicks >= 1000, clicks >= 500, clicks >= 100, clicks > 0]),
+        'gsc_position': (position, [(position > 0) & (position <= 10), position <= 20, position <= 50]),
+        'adobe_traffic': (traffic, [traffic >= 5000, traffic >= 1000, traffic >= 100]),
+        'demand_volume': (demand, [demand >= 50000, demand >= 10000, demand >= 1000]),
+    }
+    
+    score = np.zeros(n, dtype=np.int64)
+    factors = [[] for _ in range(n)] if explain else None
+    for name, (values, conditions) in bands.items():
+        points, labels = _INDEXATION_BANDS[name]
+        band = np.select(conditions, np.arange(1, len(conditions) + 1), 0)
+        score += np.array([0] + points)[band]
+        
+        if explain:
+            for level, label in enumerate(labels, start=1):
+                rows = np.flatnonzero(band == level)
+                for i, value in zip(rows.tolist(), values[rows].tolist()):
+                    factors[i].append(label.format(value))
+    
+    decision = np.select([score >= 70, score >= 40], ['INDEX', 'EVALUATE'], 'NOINDEX').astype(object)
+    result = pd.DataFrame({'score': score, 'decision': decision})
+    
+    if explain:
+        result['explanation'] = [
+            _INDEXATION_PREFIXES[d] + (', '.join(f) if f or d != 'NOINDEX' else 'Sin datos significativos')
+            for d, f in zip(decision, factors)
+        ]
+    
+    return result
+
+
+def generate_scoring_report(scores: ScoreList, family_name: str = "") -> str:
     """Genera reporte de scoring en markdown"""
-    scorer = FacetScorer()
-    tier_summary = scorer.get_tier_summary(scores)
+    table = _score_frame(scores)
+    tier_summary = get_tier_summary(table)
     
     report = f"""
 # Reporte de Scoring de Facetas
@@ -475,16 +902,25 @@ def generate_scoring_report(scores: List[FacetScore], family_name: str = "") ->
 |--------|-------|------|---------|---------|------|------------|
 """
     
-    for score in sorted(scores, key=lambda x: x.total_score, reverse=True)[:10]:
-        wrapper_icon = "✅" if score.in_wrapper else "❌"
-        report += f"| {score.facet_name} | {score.total_score:.0f} | {score.tier} | {score.demand_value:,} | {score.traffic_value:,} | {score.urls_200} | {wrapper_icon} |\n"
-    
-    report += """
+    # Top 10 (nlargest con keep='first' respeta el orden original en empates)
+    if _is_descending(table['total_score'].to_numpy(dtype=np.float64)):
+        top = table.head(10)
+    else:
+        top = table.nlargest(10, 'total_score', keep='first')
+    rows = ("| " + top['facet_name'].astype(str) +
+            " | " + top['total_score'].map('{:.0f}'.format).astype(str) +
+            " | " + top['tier'].astype(str) +
+            " | " + top['demand_value'].map('{:,}'.format).astype(str) +
+            " | " + top['traffic_value'].map('{:,}'.format).astype(str) +
+            " | " + top['urls_200'].astype(str) +
+            " | " + np.where(top['in_wrapper'].to_numpy(dtype=bool), "✅", "❌") + " |\n")
+    
+    parts = [report, ''.join(rows), """
 ## Acciones Prioritarias
 
-"""
-    priority_actions = scorer.get_priority_actions(scores, 5)
+"""]
+    priority_actions = get_priority_actions(table, 5)
     for i, action in enumerate(priority_actions, 1):
-        report += f"{i}. **{action['facet']}** (Tier {action['priority']}): Añadir a seoFilterWrapper - {action['urls_available']} URLs disponibles, potencial {action['potential_traffic']:,} búsquedas\n"
+        parts.append(f"{i}. **{action['facet']}** (Tier {action['priority']}): Añadir a seoFilterWrapper - {action['urls_available']} URLs disponibles, potencial {action['potential_traffic']:,} búsquedas\n")
     
-    return report
+    return ''.join(parts)
@@ -10,9 +10,11 @@ import numpy as np
 from pathlib import Path
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import tempfile
 import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Configuración de página (debe ser lo primero)
 st.set_page_config(
@@ -23,17 +25,18 @@ st.set_page_config(
 )
 
 # Imports de módulos propios
-from data.loaders import DataLoader, FileType, LoadResult, validate_data_integrity
+from data.loaders import (
+    DataLoader, FileType, LoadResult, summarize_crawl_status,
+    validate_data_integrity
+)
 from data.family_library import FamilyLibrary, FamilyMetadata, get_default_library
 from data.data_config import (
     FacetDetector, FacetMapping, DatasetContext,
     render_facet_mapping_ui, validate_regex_pattern
 )
-from data.drive_storage import HybridLibraryStorage, render_drive_config_ui
 
-from analysis.authority_analyzer import AuthorityAnalyzer, get_wrapper_distribution
-from analysis.facet_analyzer import FacetAnalyzer
-from analysis.scoring import FacetScorer, generate_scoring_report
+# Los módulos de análisis y Drive se importan dentro de la pestaña que los usa:
+# la pantalla de inicio se pinta sin cargarlos
 
 from config.settings import (
     AI_CONFIGS, ANALYSIS_THRESHOLDS, DATA_KEYS, CRAWL_KEYS_PRIORITY
@@ -48,6 +51,10 @@ VERSION = "2.3"
 # Claves de datos unificadas (desde settings.py)
 UNIFIED_DATA_KEYS = DATA_KEYS
 
+# Las pestañas de análisis son fragments: sus widgets solo re-ejecutan la pestaña,
+# no la barra lateral ni el resto del script (st.fragment existe desde Streamlit 1.37)
+tab_fragment = getattr(st, 'fragment', lambda func: func)
+
 # =============================================================================
 # FUNCIONES DE UTILIDAD
 # =============================================================================
@@ -56,6 +63,7 @@ def init_session_state():
     """Inicializa el estado de sesión"""
     defaults = {
         'loaded_data': {},
+        'loaded_hashes': {},
         'current_family': None,
         'family_metadata': None,
         'facet_mappings': [],
@@ -108,37 +116,189 @@ def get_data_by_key(key: str) -> Optional[pd.DataFrame]:
     return st.session_state.get('loaded_data', {}).get(key)
 
 
+def get_crawl_stats(crawl: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Conteos por código de respuesta del crawl, calculados una vez por crawl cargado
+    Se guardan en session_state junto al propio DataFrame: si el crawl cambia, se recalculan
+    """
+    cached = st.session_state.get('crawl_stats')
+    if cached is not None and cached[0] is crawl:
+        return cached[1]
+    
+    summary = summarize_crawl_status(crawl)
+    has_status = 'urls_200' in summary
+    stats = {
+        'total': summary['total_urls'],
+        'has_status': has_status,
+        'urls_200': summary.get('urls_200', 0),
+        'urls_404': summary.get('urls_404', 0),
+        'with_wrapper': summary.get('with_wrapper') if has_status else None,
+        'wrapper_distribution': None,  # Se calcula al abrir la pestaña de autoridad
+    }
+    
+    st.session_state['crawl_stats'] = (crawl, stats)
+    return stats
+
+
+def get_export_payload(name: str, source: Any, build) -> Any:
+    """
+    Contenido de una descarga, generado una vez por resultado de análisis
+    Se guarda en session_state junto a su origen: si el resultado cambia, se regenera
+    """
+    payloads = st.session_state.setdefault('export_payloads', {})
+    cached = payloads.get(name)
+    if cached is not None and cached[0] is source:
+        return cached[1]
+    
+    payload = build()
+    payloads[name] = (source, payload)
+    return payload
+
+
+@st.cache_resource(show_spinner=False)
+def _library_resource() -> FamilyLibrary:
+    """Biblioteca local compartida entre reruns (el índice se lee una sola vez)"""
+    return get_default_library()
+
+
+def get_library() -> FamilyLibrary:
+    """Biblioteca cacheada, recargada solo si el índice cambió en disco"""
+    library = _library_resource()
+    library.refresh()
+    return library
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def list_families_cached(index_mtime: float) -> List[Dict]:
+    """Listado de familias cacheado por versión del índice"""
+    return get_library().list_families()
+
+
+# Hilos para parsear varios archivos subidos a la vez
+UPLOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+# Columnas del crawl que usa FacetDetector
+DETECTOR_COLUMNS = ['Dirección', 'Código de respuesta']
+
+# Columnas del crawl que usa AuthorityAnalyzer
+AUTHORITY_COLUMNS = ['Dirección', 'url', 'Código de respuesta', 'status_code', 'wrapper_link_count']
+
+
+def frame_fingerprint(df: Optional[pd.DataFrame], columns: List[str]) -> str:
+    """Huella barata de las columnas indicadas de un DataFrame, para cachear resultados derivados"""
+    if df is None:
+        return ''
+    digest = hashlib.blake2b(str(len(df)).encode(), digest_size=16)
+    for col in columns:
+        if col in df.columns:
+            digest.update(col.encode())
+            digest.update(pd.util.hash_pandas_object(df[col], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def crawl_fingerprint(crawl: pd.DataFrame) -> str:
+    """Huella barata del crawl (URLs y estados), para cachear resultados derivados"""
+    return frame_fingerprint(crawl, DETECTOR_COLUMNS)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def detect_facets_cached(fingerprint: str, base_url: str,
+                         _crawl: pd.DataFrame) -> tuple:
+    """
+    Facetas detectadas y patrones desconocidos, cacheados por (huella del crawl, URL base)
+    Repetir la detección sobre el mismo crawl no vuelve a recorrer las URLs
+    """
+    detector = FacetDetector(_crawl, base_url)
+    return detector.detect_all(), detector.detect_unknown_patterns()
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def authority_analysis_cached(crawl_fp: str, adobe_fp: str,
+                              _crawl: pd.DataFrame, _adobe_urls: Optional[pd.DataFrame]):
+    """
+    Análisis de autoridad cacheado por (huella del crawl, huella de Adobe URLs)
+    Repetir el análisis sobre los mismos datos no vuelve a cruzarlos
+    """
+    from analysis.authority_analyzer import AuthorityAnalyzer
+    
+    return AuthorityAnalyzer(_crawl, _adobe_urls).get_full_analysis()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def score_facets_cached(facets_data: List[Dict], weights_key: tuple) -> pd.DataFrame:
+    """
+    Scoring cacheado por (datos de facetas, pesos), como tabla de scores
+    Volver a una combinación de pesos ya calculada no recalcula nada
+    """
+    from analysis.scoring import FacetScorer, ScoringWeights
+    
+    scorer = FacetScorer(weights=ScoringWeights(*weights_key))
+    return scorer.score_table(facets_data)
+
+
 # =============================================================================
 # CARGA DE DATOS
 # =============================================================================
 
-def process_uploaded_files(uploaded_files: List) -> Dict[str, LoadResult]:
-    """Procesa archivos subidos y retorna resultados"""
-    results = {}
-    loader = DataLoader()
-    
-    for uploaded_file in uploaded_files:
-        try:
-            # Guardar temporalmente
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp:
-                tmp.write(uploaded_file.getvalue())
-                tmp_path = tmp.name
-            
-            # Cargar y detectar tipo - pasar nombre original para detección
-            result = loader.load_file(tmp_path, original_filename=uploaded_file.name)
-            results[uploaded_file.name] = result
-            
-            # Limpiar temporal
-            os.unlink(tmp_path)
-            
-        except Exception as e:
-            results[uploaded_file.name] = LoadResult(
-                success=False,
-                file_type=FileType.UNKNOWN,
-                error=str(e)
-            )
+def upload_fingerprint(uploaded_file) -> str:
+    """Hash del contenido de un archivo subido (sin copiar sus bytes)"""
+    return hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+
+
+@st.cache_data(ttl=24 * 3600, show_spinner=False, max_entries=16)
+def load_upload_cached(fingerprint: str, filename: str, _uploaded_file) -> LoadResult:
+    """
+    Carga un archivo subido, cacheado por (hash del contenido, nombre)
+    Volver a procesar los mismos archivos no vuelve a parsear el CSV
+    """
+    # Se lee directamente del buffer subido (ya en memoria), sin temporal en disco
+    # Pasar nombre original para detección
+    result = DataLoader().load_file(_uploaded_file, original_filename=filename)
+    result.metadata['content_hash'] = fingerprint
+    return result
+
+
+def load_upload(uploaded_file) -> LoadResult:
+    """Carga un archivo subido; los errores se devuelven como LoadResult fallido"""
+    try:
+        return load_upload_cached(
+            upload_fingerprint(uploaded_file), uploaded_file.name, uploaded_file
+        )
+    except Exception as e:
+        return LoadResult(
+            success=False,
+            file_type=FileType.UNKNOWN,
+            error=str(e)
+        )
+
+
+def process_uploaded_files(uploaded_files: List,
+                           on_loaded: Callable[[int, LoadResult], None] = None) -> Dict[str, LoadResult]:
+    """
+    Procesa archivos subidos y retorna resultados
+    Con varios archivos se parsean en hilos (el parser C de pandas libera el GIL)
+    
+    Args:
+        on_loaded: Se llama en el hilo principal con la posición y el resultado
+            de cada archivo en cuanto termina (para mostrar progreso)
+    """
+    loaded = [None] * len(uploaded_files)
     
-    return results
+    def finish(index: int, result: LoadResult):
+        loaded[index] = result
+        if on_loaded:
+            on_loaded(index, result)
+    
+    if UPLOAD_WORKERS > 1 and len(uploaded_files) > 1:
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(uploaded_files))) as executor:
+            futures = {executor.submit(load_upload, f): i for i, f in enumerate(uploaded_files)}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+    else:
+        for i, uploaded_file in enumerate(uploaded_files):
+            finish(i, load_upload(uploaded_file))
+    
+    return {uploaded_file.name: result for uploaded_file, result in zip(uploaded_files, loaded)}
 
 
 def process_loaded_data(results: Dict[str, LoadResult]) -> bool:
@@ -149,12 +309,20 @@ def process_loaded_data(results: Dict[str, LoadResult]) -> bool:
     loaded_count = 0
     error_count = 0
     warnings = []
+    loaded_data = st.session_state['loaded_data']
+    loaded_hashes = st.session_state.setdefault('loaded_hashes', {})
     
     for filename, result in results.items():
         if result.success and result.dataframe is not None:
             # Usar clave unificada basada en el tipo de archivo
             key = result.file_type.value
-            st.session_state['loaded_data'][key] = result.dataframe
+            content_hash = result.metadata.get('content_hash')
+            
+            # Mismo contenido ya cargado: se conserva el DataFrame existente, y con él
+            # lo memoizado sobre él (conteos del crawl, descargas, análisis cacheados)
+            if not (content_hash and key in loaded_data and loaded_hashes.get(key) == content_hash):
+                loaded_data[key] = result.dataframe
+                loaded_hashes[key] = content_hash
             loaded_count += 1
             
             # Mostrar info
@@ -177,6 +345,11 @@ def process_loaded_data(results: Dict[str, LoadResult]) -> bool:
     elif loaded_count > 0:
         st.session_state['data_loaded'] = True
         
+        # Conteos del crawl una sola vez al cargar; las pestañas los reutilizan
+        crawl = get_crawl_data()
+        if crawl is not None:
+            get_crawl_stats(crawl)
+        
         # Validar integridad de datos
         validation = validate_data_integrity(st.session_state['loaded_data'])
         if not validation['valid']:
@@ -192,7 +365,7 @@ def process_loaded_data(results: Dict[str, LoadResult]) -> bool:
 def load_family_data(family_id: str) -> bool:
     """Carga datos de una familia guardada"""
     try:
-        library = get_default_library()
+        library = get_library()
         
         if not library.family_exists(family_id):
             show_error(f"Familia '{family_id}' no encontrada")
@@ -207,10 +380,15 @@ def load_family_data(family_id: str) -> bool:
         
         # Actualizar session_state
         st.session_state['loaded_data'] = data
+        st.session_state['loaded_hashes'] = {}
         st.session_state['current_family'] = family_id
         st.session_state['family_metadata'] = library.get_family(family_id)
         st.session_state['data_loaded'] = True
         
+        crawl = get_crawl_data()
+        if crawl is not None:
+            get_crawl_stats(crawl)
+        
         show_success(f"Familia '{family_id}' cargada con {len(data)} datasets")
         return True
         
@@ -278,6 +456,7 @@ def render_sidebar():
             
             if st.button("🔄 Recargar datos", use_container_width=True):
                 st.session_state['loaded_data'] = {}
+                st.session_state['loaded_hashes'] = {}
                 st.session_state['data_loaded'] = False
                 st.rerun()
 
@@ -325,26 +504,22 @@ def render_home_tab():
         if crawl is not None:
             col1, col2, col3, col4 = st.columns(4)
             
-            status_col = 'Código de respuesta' if 'Código de respuesta' in crawl.columns else None
+            stats = get_crawl_stats(crawl)
             
             with col1:
-                st.metric("URLs Totales", f"{len(crawl):,}")
+                st.metric("URLs Totales", f"{stats['total']:,}")
             
             with col2:
-                if status_col:
-                    urls_200 = len(crawl[crawl[status_col] == 200])
-                    st.metric("URLs 200", f"{urls_200:,}")
+                if stats['has_status']:
+                    st.metric("URLs 200", f"{stats['urls_200']:,}")
             
             with col3:
-                if status_col:
-                    urls_404 = len(crawl[crawl[status_col] == 404])
-                    st.metric("URLs 404", f"{urls_404:,}")
+                if stats['has_status']:
+                    st.metric("URLs 404", f"{stats['urls_404']:,}")
             
             with col4:
-                if 'has_wrapper' in crawl.columns and status_col:
-                    crawl_200 = crawl[crawl[status_col] == 200]
-                    with_wrapper = len(crawl_200[crawl_200['has_wrapper'] == True])
-                    st.metric("Con Wrapper", f"{with_wrapper:,}")
+                if stats['with_wrapper'] is not None:
+                    st.metric("Con Wrapper", f"{stats['with_wrapper']:,}")
     else:
         st.info("👈 Ve a **Cargar Datos** para comenzar")
 
@@ -375,7 +550,21 @@ def render_load_tab():
         if uploaded_files:
             if st.button("🚀 Procesar Archivos", type="primary"):
                 with st.spinner("Procesando archivos..."):
-                    results = process_uploaded_files(uploaded_files)
+                    # Una línea por archivo que se actualiza en cuanto termina de leerse
+                    placeholders = [st.empty() for _ in uploaded_files]
+                    for placeholder, uploaded_file in zip(placeholders, uploaded_files):
+                        placeholder.caption(f"⏳ {uploaded_file.name}")
+                    
+                    def show_loaded(index: int, result: LoadResult):
+                        name = uploaded_files[index].name
+                        if result.success:
+                            placeholders[index].caption(f"📄 {name}: {result.row_count:,} filas leídas")
+                        else:
+                            placeholders[index].caption(f"❌ {name}")
+                    
+                    results = process_uploaded_files(uploaded_files, on_loaded=show_loaded)
+                    for placeholder in placeholders:
+                        placeholder.empty()
                     success = process_loaded_data(results)
                     
                     if success:
@@ -384,8 +573,8 @@ def render_load_tab():
     with tab2:
         st.subheader("📚 Biblioteca de Familias")
         
-        library = get_default_library()
-        families = library.list_families()
+        library = get_library()
+        families = list_families_cached(library.index_mtime)
         
         if families:
             for family in families:
@@ -452,6 +641,7 @@ def render_load_tab():
                         except Exception as e:
                             st.warning(f"No se pudo añadir {key}: {e}")
                     
+                    list_families_cached.clear()
                     st.session_state['current_family'] = metadata.id
                     st.session_state['family_metadata'] = metadata
                     show_success(f"Familia '{name}' creada exitosamente")
@@ -461,9 +651,11 @@ def render_load_tab():
                     show_error(f"Error creando familia: {e}")
     
     with tab3:
+        from data.drive_storage import render_drive_config_ui
         render_drive_config_ui()
 
 
+@tab_fragment
 def render_config_tab():
     """Renderiza la pestaña de configuración de facetas"""
     st.title("⚙️ Configurar Facetas")
@@ -493,9 +685,7 @@ def render_config_tab():
     # Detectar facetas
     if st.button("🔍 Detectar Facetas Automáticamente", type="primary"):
         with st.spinner("Analizando URLs..."):
-            detector = FacetDetector(crawl, base_url)
-            detected = detector.detect_all()
-            unknown = detector.detect_unknown_patterns()
+            detected, unknown = detect_facets_cached(crawl_fingerprint(crawl), base_url, crawl)
             
             st.session_state['facet_mappings'] = detected
             st.session_state['unknown_patterns'] = unknown
@@ -514,8 +704,11 @@ def render_config_tab():
             show_success(f"Guardadas {len(verified)} facetas")
 
 
+@tab_fragment
 def render_authority_tab():
     """Renderiza la pestaña de análisis de autoridad"""
+    from analysis.authority_analyzer import ADOBE_URL_COLUMNS, get_wrapper_distribution, leaks_to_dataframe
+    
     st.title("🔗 Análisis de Autoridad")
     
     if not st.session_state.get('data_loaded'):
@@ -532,8 +725,11 @@ def render_authority_tab():
     # Ejecutar análisis
     if st.button("▶️ Ejecutar Análisis de Autoridad", type="primary"):
         with st.spinner("Analizando fuga de autoridad..."):
-            analyzer = AuthorityAnalyzer(crawl, adobe_urls)
-            result = analyzer.get_full_analysis()
+            result = authority_analysis_cached(
+                frame_fingerprint(crawl, AUTHORITY_COLUMNS),
+                frame_fingerprint(adobe_urls, ADOBE_URL_COLUMNS),
+                crawl, adobe_urls
+            )
             
             st.session_state['analysis_results']['authority'] = result
             show_success("Análisis completado")
@@ -566,7 +762,7 @@ def render_authority_tab():
         if result.top_leaks:
             st.subheader("📋 Top Fugas de Autoridad")
             
-            leaks_df = pd.DataFrame([l.to_dict() for l in result.top_leaks])
+            leaks_df = leaks_to_dataframe(result.top_leaks)
             st.dataframe(
                 leaks_df,
                 use_container_width=True,
@@ -575,12 +771,18 @@ def render_authority_tab():
         
         # Distribución de wrapper
         st.subheader("📊 Distribución de Enlaces en seoFilterWrapper")
-        distribution = get_wrapper_distribution(crawl)
+        stats = get_crawl_stats(crawl)
+        if stats['wrapper_distribution'] is None:
+            stats['wrapper_distribution'] = get_wrapper_distribution(crawl)
+        distribution = stats['wrapper_distribution']
         st.bar_chart(distribution.set_index('range')['count'])
 
 
+@tab_fragment
 def render_facets_tab():
     """Renderiza la pestaña de análisis de facetas"""
+    from analysis.facet_analyzer import FacetAnalyzer
+    
     st.title("🏷️ Análisis de Facetas")
     
     if not st.session_state.get('data_loaded'):
@@ -642,7 +844,7 @@ def render_facets_tab():
         if result.facets:
             st.subheader("📋 Estado de Facetas")
             
-            facets_df = pd.DataFrame([f.to_dict() for f in result.facets])
+            facets_df = result.get_table()
             
             # Ordenar por opportunity_score
             facets_df = facets_df.sort_values('opportunity_score', ascending=False)
@@ -657,23 +859,37 @@ def render_facets_tab():
         if result.opportunities:
             st.subheader("🚀 Oportunidades Detectadas")
             
-            for opp in result.opportunities[:10]:
-                with st.expander(f"**{opp.name}** - Score: {opp.opportunity_score:.0f}"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("URLs Activas", opp.urls_200)
-                        st.metric("Demanda Adobe", f"{opp.demand_adobe:,}")
-                    
-                    with col2:
-                        st.metric("Tráfico SEO", f"{opp.traffic_seo:,}")
-                        st.metric("En Wrapper", "✅" if opp.in_wrapper else "❌")
-                    
-                    st.info(opp.recommendation)
+            # Una sola tabla en lugar de un expander con métricas por oportunidad
+            top_opportunities = result.opportunities[:10]
+            opportunities_df = pd.DataFrame({
+                'Faceta': [o.name for o in top_opportunities],
+                'Score': [o.opportunity_score for o in top_opportunities],
+                'URLs Activas': [o.urls_200 for o in top_opportunities],
+                'Demanda Adobe': [o.demand_adobe for o in top_opportunities],
+                'Tráfico SEO': [o.traffic_seo for o in top_opportunities],
+                'En Wrapper': [o.in_wrapper for o in top_opportunities],
+                'Recomendación': [o.recommendation for o in top_opportunities],
+            })
+            
+            st.dataframe(
+                opportunities_df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'Score': st.column_config.ProgressColumn(
+                        'Score', min_value=0, max_value=100, format="%.0f"
+                    ),
+                    'Demanda Adobe': st.column_config.NumberColumn(format="%d"),
+                    'Tráfico SEO': st.column_config.NumberColumn(format="%d"),
+                }
+            )
 
 
+@tab_fragment
 def render_strategy_tab():
     """Renderiza la pestaña de estrategia"""
+    from analysis.scoring import scores_to_dataframe, get_tier_summary, get_priority_actions
+    
     st.title("📊 Estrategia de Enlazado")
     
     if not st.session_state.get('data_loaded'):
@@ -710,30 +926,29 @@ def render_strategy_tab():
     
     if st.button("📈 Generar Scoring", type="primary"):
         with st.spinner("Calculando scores..."):
-            from analysis.scoring import ScoringWeights
-            
-            weights = ScoringWeights(
-                demand_weight=demand_weight / total,
-                performance_weight=performance_weight / total,
-                coverage_weight=coverage_weight / total,
-                opportunity_weight=opportunity_weight / total
+            # FacetScorer normaliza los pesos; la clave redondeada evita
+            # recalcular por ruido de coma flotante de los sliders
+            weights_key = tuple(
+                round(w, 4) for w in
+                (demand_weight, performance_weight, coverage_weight, opportunity_weight)
             )
             
-            scorer = FacetScorer(weights=weights)
-            
-            # Preparar datos para scoring
-            facets_data = []
-            for facet in facet_result.facets:
-                facets_data.append({
-                    'facet_name': facet.name,
-                    'demand': facet.demand_adobe + facet.demand_keywords,
-                    'traffic': facet.traffic_seo,
-                    'urls_200': facet.urls_200,
-                    'urls_404': facet.urls_404,
-                    'in_wrapper': facet.in_wrapper,
-                })
-            
-            scores = scorer.score_multiple(facets_data)
+            # Preparar datos para scoring desde la tabla por columnas
+            table = facet_result.get_table()
+            facets_data = [
+                {'facet_name': name, 'demand': demand, 'traffic': traffic,
+                 'urls_200': u200, 'urls_404': u404, 'in_wrapper': wrapper}
+                for name, demand, traffic, u200, u404, wrapper in zip(
+                    table['name'].tolist(),
+                    (table['demand_adobe'] + table['demand_keywords']).tolist(),
+                    table['traffic_seo'].tolist(),
+                    table['urls_200'].tolist(),
+                    table['urls_404'].tolist(),
+                    table['in_wrapper'].tolist(),
+                )
+            ]
+            
+            scores = score_facets_cached(facets_data, weights_key)
             st.session_state['analysis_results']['scores'] = scores
             
             show_success("Scoring completado")
@@ -745,8 +960,7 @@ def render_strategy_tab():
         # Resumen por tier
         st.subheader("📊 Distribución por Tier")
         
-        scorer = FacetScorer()
-        tier_summary = scorer.get_tier_summary(scores)
+        tier_summary = get_tier_summary(scores)
         
         col1, col2, col3, col4, col5 = st.columns(5)
         
@@ -766,7 +980,7 @@ def render_strategy_tab():
         # Tabla completa
         st.subheader("📋 Scoring Completo")
         
-        scores_df = scorer.to_dataframe(scores)
+        scores_df = scores_to_dataframe(scores)
         st.dataframe(
             scores_df,
             use_container_width=True,
@@ -776,7 +990,7 @@ def render_strategy_tab():
         # Acciones prioritarias
         st.subheader("⚡ Acciones Prioritarias")
         
-        actions = scorer.get_priority_actions(scores, 10)
+        actions = get_priority_actions(scores, 10)
         
         for i, action in enumerate(actions, 1):
             st.markdown(
@@ -787,8 +1001,12 @@ def render_strategy_tab():
             )
 
 
+@tab_fragment
 def render_export_tab():
     """Renderiza la pestaña de exportación"""
+    from analysis.authority_analyzer import leaks_to_dataframe
+    from analysis.scoring import generate_scoring_report, scores_to_dataframe
+    
     st.title("📤 Exportar Resultados")
     
     if not st.session_state.get('data_loaded'):
@@ -810,10 +1028,10 @@ def render_export_tab():
         if 'scores' in results:
             st.markdown("### 📈 Scoring de Facetas")
             
-            scorer = FacetScorer()
-            scores_df = scorer.to_dataframe(results['scores'])
-            
-            csv = scores_df.to_csv(index=False)
+            scores = results['scores']
+            csv = get_export_payload(
+                'scores_csv', scores, lambda: scores_to_dataframe(scores).to_csv(index=False)
+            )
             st.download_button(
                 "📥 Descargar CSV",
                 csv,
@@ -826,7 +1044,10 @@ def render_export_tab():
             family_name = st.session_state.get('family_metadata', {})
             family_name = family_name.name if hasattr(family_name, 'name') else ""
             
-            report = generate_scoring_report(results['scores'], family_name)
+            report = get_export_payload(
+                f'scoring_report:{family_name}', scores,
+                lambda: generate_scoring_report(scores, family_name)
+            )
             st.download_button(
                 "📥 Descargar Reporte (MD)",
                 report,
@@ -840,10 +1061,13 @@ def render_export_tab():
         if 'authority' in results:
             st.markdown("### 🔗 Análisis de Autoridad")
             
-            leaks_df = pd.DataFrame([l.to_dict() for l in results['authority'].top_leaks])
+            authority = results['authority']
             
-            if len(leaks_df) > 0:
-                csv = leaks_df.to_csv(index=False)
+            if authority.top_leaks:
+                csv = get_export_payload(
+                    'leaks_csv', authority,
+                    lambda: leaks_to_dataframe(authority.top_leaks).to_csv(index=False)
+                )
                 st.download_button(
                     "📥 Descargar Fugas (CSV)",
                     csv,
@@ -860,7 +1084,7 @@ def render_export_tab():
         
         if st.button("📥 Exportar como ZIP"):
             try:
-                library = get_default_library()
+                library = get_library()
                 family_id = st.session_state['current_family']
                 
                 with tempfile.TemporaryDirectory() as tmpdir:
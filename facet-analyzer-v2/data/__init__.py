@@ -9,6 +9,7 @@ from .loaders import (
     LoadResult,
     DatasetStats,
     validate_data_integrity,
+    summarize_crawl_status,
     render_file_upload_ui
 )
 
@@ -30,6 +31,16 @@ from .data_config import (
     render_facet_mapping_ui
 )
 
+from .pattern_matching import (
+    compile_pattern,
+    is_literal_pattern,
+    match_pattern,
+    match_patterns,
+    sum_by_patterns,
+    count_by_patterns,
+    aggregate_by_patterns
+)
+
 __all__ = [
     # Loaders
     'DataLoader',
@@ -38,6 +49,7 @@ __all__ = [
     'LoadResult',
     'DatasetStats',
     'validate_data_integrity',
+    'summarize_crawl_status',
     'render_file_upload_ui',
     
     # Family Library
@@ -55,4 +67,13 @@ __all__ = [
     'validate_regex_pattern',
     'render_data_period_config',
     'render_facet_mapping_ui',
+    
+    # Pattern Matching
+    'compile_pattern',
+    'is_literal_pattern',
+    'match_pattern',
+    'match_patterns',
+    'sum_by_patterns',
+    'count_by_patterns',
+    'aggregate_by_patterns',
 ]
@@ -5,11 +5,14 @@ Genérico para cualquier categoría de productos
 """
 
 import pandas as pd
+import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 import re
 
+from .pattern_matching import compile_pattern, match_pattern
+
 # Streamlit es opcional
 try:
     import streamlit as st
@@ -394,21 +397,35 @@ class FacetDetector:
         for brands in self.KNOWN_BRANDS.values():
             all_brands.update(brands)
         
-        found_brands = []
-        for brand in all_brands:
-            pattern = f'/{brand}(/|$)'
-            try:
-                count = sum(1 for url in self.urls if re.search(pattern, url.lower()))
-                if count > 5:
-                    found_brands.append(brand)
-            except Exception:
+        # Una sola pasada: segmentos de ruta que son marcas, por URL.
+        # '/marca(/|$)' equivale a un segmento tras '/', y '/marca/' a uno no final
+        path_hits = []
+        inner_hits = []
+        for url in self.urls:
+            if not isinstance(url, str):
                 continue
+            segments = url.lower().split('/')[1:]
+            if not segments:
+                continue
+            inner = all_brands.intersection(segments[:-1])
+            inner_hits.extend(inner)
+            path_hits.extend(inner.union(all_brands.intersection(segments[-1:])))
         
-        return sorted(
-            found_brands, 
-            key=lambda b: sum(1 for u in self.urls if f'/{b}/' in u.lower()), 
-            reverse=True
-        )
+        brands, counts = np.unique(np.array(path_hits, dtype=object), return_counts=True)
+        found_brands = [b for b, c in zip(brands.tolist(), counts.tolist()) if c > 5]
+        
+        inner_brands, inner_counts = np.unique(np.array(inner_hits, dtype=object), return_counts=True)
+        inner_count = dict(zip(inner_brands.tolist(), inner_counts.tolist()))
+        
+        return sorted(found_brands, key=lambda b: inner_count.get(b, 0), reverse=True)
+    
+    def _status_masks(self, pattern: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Máscaras de URLs 200 y 404 que coinciden con un patrón"""
+        mask = match_pattern(self.crawl['Dirección'], pattern)
+        if 'Código de respuesta' in self.crawl.columns:
+            status = self.crawl['Código de respuesta']
+            return mask & (status == 200).to_numpy(), mask & (status == 404).to_numpy()
+        return mask, np.zeros(len(mask), dtype=bool)
     
     def detect_all(self) -> List[FacetMapping]:
         """Detecta todas las facetas en las URLs"""
@@ -458,31 +475,21 @@ class FacetDetector:
             return
         
         try:
-            if 'Código de respuesta' in self.crawl.columns:
-                urls_200 = self.crawl[
-                    (self.crawl['Código de respuesta'] == 200) &
-                    (self.crawl['Dirección'].str.contains(pattern, case=False, na=False, regex=True))
-                ]
-                urls_404 = self.crawl[
-                    (self.crawl['Código de respuesta'] == 404) &
-                    (self.crawl['Dirección'].str.contains(pattern, case=False, na=False, regex=True))
-                ]
-            else:
-                urls_200 = self.crawl[
-                    self.crawl['Dirección'].str.contains(pattern, case=False, na=False, regex=True)
-                ]
-                urls_404 = pd.DataFrame()
+            mask_200, mask_404 = self._status_masks(pattern)
+            count_200 = int(np.count_nonzero(mask_200))
+            count_404 = int(np.count_nonzero(mask_404))
             
-            if len(urls_200) > 0 or len(urls_404) > 0:
-                examples = urls_200['Dirección'].head(5).tolist() if len(urls_200) > 0 else urls_404['Dirección'].head(5).tolist()
+            if count_200 > 0 or count_404 > 0:
+                urls = self.crawl['Dirección'].to_numpy()
+                examples = urls[mask_200 if count_200 > 0 else mask_404][:5].tolist()
                 
                 self.detected_facets.append(FacetMapping(
                     facet_id=facet_id,
                     facet_name=facet_name,
                     pattern=pattern,
                     url_examples=examples,
-                    url_count_200=len(urls_200),
-                    url_count_404=len(urls_404),
+                    url_count_200=count_200,
+                    url_count_404=count_404,
                     adobe_filter_match=adobe_filter_prefix,
                     user_verified=False,
                     category=category
@@ -516,20 +523,15 @@ class FacetDetector:
         for brands in self.KNOWN_BRANDS.values():
             known_patterns.extend(brands)
         
+        # Compilar una sola vez (los patrones inválidos se descartan)
+        compiled_known = [c for c in (compile_pattern(p) for p in known_patterns if p) if c is not None]
+        known_brands = frozenset(b for brands in self.KNOWN_BRANDS.values() for b in brands)
+        
         unknown = []
         for segment, data in all_segments.items():
             if data['count'] > 10:
-                is_known = False
-                for p in known_patterns:
-                    if p:
-                        try:
-                            if re.search(p, segment, re.IGNORECASE):
-                                is_known = True
-                                break
-                        except Exception:
-                            continue
-                
-                is_known = is_known or segment in [b for brands in self.KNOWN_BRANDS.values() for b in brands]
+                is_known = (segment in known_brands
+                            or any(c.search(segment) for c in compiled_known))
                 
                 if not is_known:
                     unknown.append({
@@ -549,31 +551,20 @@ class FacetDetector:
         facet_id = f"custom_{name.lower().replace(' ', '_')}"
         
         try:
-            if 'Código de respuesta' in self.crawl.columns:
-                urls_200 = self.crawl[
-                    (self.crawl['Código de respuesta'] == 200) &
-                    (self.crawl['Dirección'].str.contains(pattern, case=False, na=False, regex=True))
-                ]
-                urls_404 = self.crawl[
-                    (self.crawl['Código de respuesta'] == 404) &
-                    (self.crawl['Dirección'].str.contains(pattern, case=False, na=False, regex=True))
-                ]
-            else:
-                urls_200 = self.crawl[
-                    self.crawl['Dirección'].str.contains(pattern, case=False, na=False, regex=True)
-                ]
-                urls_404 = pd.DataFrame()
+            mask_200, mask_404 = self._status_masks(pattern)
+            count_200 = int(np.count_nonzero(mask_200))
+            count_404 = int(np.count_nonzero(mask_404))
+            examples = self.crawl['Dirección'].to_numpy()[mask_200][:5].tolist()
         except Exception:
-            urls_200 = pd.DataFrame()
-            urls_404 = pd.DataFrame()
+            count_200, count_404, examples = 0, 0, []
         
         facet = FacetMapping(
             facet_id=facet_id,
             facet_name=name,
             pattern=pattern,
-            url_examples=urls_200['Dirección'].head(5).tolist() if len(urls_200) > 0 else [],
-            url_count_200=len(urls_200),
-            url_count_404=len(urls_404),
+            url_examples=examples,
+            url_count_200=count_200,
+            url_count_404=count_404,
             user_verified=True,
             category=category,
             is_custom=True
@@ -17,6 +17,13 @@ try:
 except ImportError:
     HAS_STREAMLIT = False
 
+# Máximo de llamadas por petición batch de la API de Drive
+DRIVE_BATCH_LIMIT = 100
+
+# Parquet procesado de cada CSV (FamilyLibrary._processed_path): derivado local que
+# se regenera desde el CSV, no se sube ni se baja de Drive
+LOCAL_ONLY_SUFFIX = '_processed.parquet'
+
 
 class GoogleDriveStorage:
     """
@@ -145,27 +152,74 @@ class GoogleDriveStorage:
         except Exception:
             return None
     
-    def save_family(self, family_id: str, local_path: Path) -> bool:
-        """Guarda una familia en Drive"""
+    def list_family_folders(self) -> Dict[str, str]:
+        """Carpetas de familia en Drive como {nombre: id} (una sola llamada)"""
+        if not self.is_configured():
+            return {}
+        
+        try:
+            results = self.service.files().list(
+                q=f"'{self.folder_id}' in parents and mimeType='application/vnd.google-apps.folder'",
+                fields="files(id, name)"
+            ).execute()
+            return {f['name']: f['id'] for f in results.get('files', [])}
+        except Exception as e:
+            print(f"Error listando carpetas: {e}")
+            return {}
+    
+    def _delete_files(self, file_ids: List[str]) -> int:
+        """
+        Elimina archivos agrupando las llamadas en peticiones batch
+        
+        Returns:
+            Número de archivos que no se pudieron eliminar
+        """
+        failed = []
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                failed.append(request_id)
+        
+        for start in range(0, len(file_ids), DRIVE_BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for file_id in file_ids[start:start + DRIVE_BATCH_LIMIT]:
+                batch.add(self.service.files().delete(fileId=file_id))
+            batch.execute()
+        
+        return len(failed)
+    
+    def save_family(self, family_id: str, local_path: Path,
+                    family_folder_id: str = None) -> bool:
+        """
+        Guarda una familia en Drive
+        
+        Args:
+            family_id: ID de la familia
+            local_path: Carpeta local de la familia
+            family_folder_id: Carpeta de Drive ya resuelta (evita buscarla)
+        """
         if not self.is_configured():
             return False
         
         try:
             from googleapiclient.http import MediaFileUpload
             
-            existing = self.service.files().list(
-                q=f"'{self.folder_id}' in parents and name='{family_id}'",
-                fields="files(id)"
-            ).execute().get('files', [])
+            if family_folder_id is None:
+                existing = self.service.files().list(
+                    q=f"'{self.folder_id}' in parents and name='{family_id}'",
+                    fields="files(id)"
+                ).execute().get('files', [])
+                if existing:
+                    family_folder_id = existing[0]['id']
             
-            if existing:
-                family_folder_id = existing[0]['id']
+            if family_folder_id:
                 old_files = self.service.files().list(
                     q=f"'{family_folder_id}' in parents",
                     fields="files(id)"
                 ).execute().get('files', [])
-                for f in old_files:
-                    self.service.files().delete(fileId=f['id']).execute()
+                failed = self._delete_files([f['id'] for f in old_files])
+                if failed:
+                    print(f"No se pudieron eliminar {failed} archivos antiguos de {family_id}")
             else:
                 folder_metadata = {
                     'name': family_id,
@@ -179,7 +233,7 @@ class GoogleDriveStorage:
                 family_folder_id = folder['id']
             
             for file_path in local_path.iterdir():
-                if file_path.is_file():
+                if file_path.is_file() and not file_path.name.endswith(LOCAL_ONLY_SUFFIX):
                     file_metadata = {
                         'name': file_path.name,
                         'parents': [family_folder_id]
@@ -228,6 +282,8 @@ class GoogleDriveStorage:
             ).execute().get('files', [])
             
             for file_info in files:
+                if file_info['name'].endswith(LOCAL_ONLY_SUFFIX):
+                    continue
                 content = self.service.files().get_media(fileId=file_info['id']).execute()
                 with open(local_path / file_info['name'], 'wb') as f:
                     f.write(content)
@@ -345,6 +401,31 @@ class HybridLibraryStorage:
         
         return self.drive.save_family(family_id, local_path)
     
+    def sync_many_to_drive(self, family_ids: List[str]) -> int:
+        """
+        Sincroniza varias familias a Drive
+        
+        Las carpetas existentes se resuelven con una única llamada y los
+        borrados de archivos antiguos van en peticiones batch.
+        
+        Returns:
+            Número de familias sincronizadas
+        """
+        if not self.is_drive_enabled():
+            return 0
+        
+        folders = self.drive.list_family_folders()
+        
+        synced = 0
+        for family_id in family_ids:
+            local_path = self.local_path / family_id
+            if not local_path.exists():
+                continue
+            if self.drive.save_family(family_id, local_path, folders.get(family_id)):
+                synced += 1
+        
+        return synced
+    
     def list_families(self, include_drive: bool = True) -> List[Dict]:
         """Lista todas las familias disponibles"""
         families = []
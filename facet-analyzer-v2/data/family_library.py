@@ -14,7 +14,7 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict, field
 import hashlib
 
-from .loaders import DataLoader, FileType, LoadResult
+from .loaders import DataLoader, FileType, LoadResult, summarize_crawl_status
 
 # Importar DATA_KEYS centralizado
 try:
@@ -133,23 +133,59 @@ class FamilyLibrary:
         
         self.index_file = self.library_path / 'index.json'
         self.families: Dict[str, FamilyMetadata] = {}
+        self.index_mtime: float = 0.0
         
         self._load_index()
     
-    def _load_index(self):
-        """Carga el índice de familias"""
+    def _index_file_mtime(self) -> float:
+        """Fecha de modificación del índice (0 si no existe)"""
+        try:
+            return self.index_file.stat().st_mtime
+        except OSError:
+            return 0.0
+    
+    def refresh(self) -> bool:
+        """
+        Recarga el índice si otro proceso lo ha modificado (p. ej. sincronización con Drive)
+        
+        Returns:
+            True si se ha recargado
+        """
+        if self._index_file_mtime() == self.index_mtime:
+            return False
+        return self._load_index()
+    
+    def _load_index(self) -> bool:
+        """
+        Carga el índice de familias
+        
+        La instancia se comparte entre sesiones (st.cache_resource): el índice se
+        parsea aparte y se sustituye de una vez. Si falla (p. ej. un índice a medio
+        escribir) se conserva lo cargado y la versión queda sin marcar, así que el
+        siguiente refresh lo reintenta.
+        
+        Returns:
+            True si se ha cargado
+        """
+        # Versión tomada antes de leer: una escritura durante la lectura fuerza otra recarga
+        mtime = self._index_file_mtime()
+        families: Dict[str, FamilyMetadata] = {}
         if self.index_file.exists():
             try:
                 with open(self.index_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     for family_id, family_data in data.get('families', {}).items():
                         try:
-                            self.families[family_id] = FamilyMetadata.from_dict(family_data)
+                            families[family_id] = FamilyMetadata.from_dict(family_data)
                         except Exception as e:
                             print(f"Error cargando familia {family_id}: {e}")
             except Exception as e:
                 print(f"Error cargando índice: {e}")
-                self.families = {}
+                return False
+        
+        self.families = families
+        self.index_mtime = mtime
+        return True
     
     def _save_index(self):
         """Guarda el índice de familias"""
@@ -162,6 +198,7 @@ class FamilyLibrary:
         }
         with open(self.index_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        self.index_mtime = self._index_file_mtime()
     
     def _generate_id(self, name: str) -> str:
         """Genera ID único para una familia"""
@@ -271,14 +308,12 @@ class FamilyLibrary:
         # Actualizar flags
         self._update_availability_flags(metadata)
         
+        # Guardar versión procesada (las cargas siguientes no re-parsean el CSV)
+        self._save_processed(result.dataframe, family_path / storage_name)
+        
         # Si es crawl maestro, recalcular estadísticas
         if result.file_type == FileType.CRAWL_MASTER:
             self._update_crawl_stats(metadata, result.dataframe)
-            # Guardar versión procesada
-            try:
-                result.dataframe.to_parquet(family_path / 'crawl_master_processed.parquet', index=False)
-            except Exception:
-                pass
         
         # Si es Adobe URLs, actualizar tráfico
         if result.file_type == FileType.ADOBE_URLS and 'visits_seo' in result.dataframe.columns:
@@ -298,6 +333,30 @@ class FamilyLibrary:
         
         return True, f"Archivo añadido como {storage_name}"
     
+    @staticmethod
+    def _processed_path(csv_path: Path) -> Path:
+        """Ruta del parquet procesado de un CSV (crawl_master.csv -> crawl_master_processed.parquet)"""
+        return csv_path.with_name(f"{csv_path.stem}_processed.parquet")
+    
+    def _save_processed(self, df: pd.DataFrame, csv_path: Path):
+        """Guarda el DataFrame ya procesado junto al CSV (best effort)"""
+        try:
+            df.to_parquet(self._processed_path(csv_path), index=False)
+        except Exception:
+            pass
+    
+    def _load_processed(self, csv_path: Path) -> Optional[pd.DataFrame]:
+        """Carga el parquet procesado si existe y no es anterior al CSV"""
+        parquet_path = self._processed_path(csv_path)
+        if not parquet_path.exists():
+            return None
+        if csv_path.exists() and parquet_path.stat().st_mtime < csv_path.stat().st_mtime:
+            return None
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception:
+            return None
+    
     def _update_availability_flags(self, metadata: FamilyMetadata):
         """Actualiza flags de disponibilidad basados en archivos"""
         files = metadata.files
@@ -311,17 +370,17 @@ class FamilyLibrary:
     
     def _update_crawl_stats(self, metadata: FamilyMetadata, df: pd.DataFrame):
         """Actualiza estadísticas del crawl"""
-        metadata.total_urls = len(df)
+        summary = summarize_crawl_status(df)
+        metadata.total_urls = summary['total_urls']
         
         if 'Código de respuesta' in df.columns:
-            metadata.urls_200 = len(df[df['Código de respuesta'] == 200])
-            metadata.urls_404 = len(df[df['Código de respuesta'] == 404])
-            metadata.urls_301 = len(df[df['Código de respuesta'] == 301])
+            metadata.urls_200 = summary['urls_200']
+            metadata.urls_404 = summary['urls_404']
+            metadata.urls_301 = summary['urls_301']
         
         if 'has_wrapper' in df.columns:
-            crawl_200 = df[df['Código de respuesta'] == 200] if 'Código de respuesta' in df.columns else df
-            metadata.with_wrapper = len(crawl_200[crawl_200['has_wrapper'] == True])
-            metadata.without_wrapper = len(crawl_200[crawl_200['has_wrapper'] == False])
+            metadata.with_wrapper = summary['with_wrapper']
+            metadata.without_wrapper = summary['without_wrapper']
     
     def create_family(self,
                       name: str,
@@ -398,40 +457,33 @@ class FamilyLibrary:
         
         # Mapeo de tipos a claves y archivos
         load_map = [
-            (metadata.has_crawl_master, 'crawl_master', 'crawl_master.csv', 'crawl_master_processed.parquet', FileType.CRAWL_MASTER),
-            (metadata.has_crawl_gsc, 'crawl_gsc', 'crawl_gsc.csv', None, FileType.CRAWL_SF_GSC),
-            (metadata.has_crawl_historical, 'crawl_historical', 'crawl_historical.csv', None, FileType.CRAWL_HISTORICAL),
-            (metadata.has_adobe_urls, 'adobe_urls', 'adobe_urls.csv', None, FileType.ADOBE_URLS),
-            (metadata.has_adobe_filters, 'adobe_filters', 'adobe_filters.csv', None, FileType.ADOBE_FILTERS),
-            (metadata.has_semrush, 'semrush', 'semrush.csv', None, FileType.SEMRUSH),
-            (metadata.has_keyword_planner, 'keyword_planner', 'keyword_planner.csv', None, FileType.KEYWORD_PLANNER),
+            (metadata.has_crawl_master, 'crawl_master', 'crawl_master.csv', FileType.CRAWL_MASTER),
+            (metadata.has_crawl_gsc, 'crawl_gsc', 'crawl_gsc.csv', FileType.CRAWL_SF_GSC),
+            (metadata.has_crawl_historical, 'crawl_historical', 'crawl_historical.csv', FileType.CRAWL_HISTORICAL),
+            (metadata.has_adobe_urls, 'adobe_urls', 'adobe_urls.csv', FileType.ADOBE_URLS),
+            (metadata.has_adobe_filters, 'adobe_filters', 'adobe_filters.csv', FileType.ADOBE_FILTERS),
+            (metadata.has_semrush, 'semrush', 'semrush.csv', FileType.SEMRUSH),
+            (metadata.has_keyword_planner, 'keyword_planner', 'keyword_planner.csv', FileType.KEYWORD_PLANNER),
         ]
         
-        for has_file, key, csv_name, parquet_name, file_type in load_map:
+        for has_file, key, csv_name, file_type in load_map:
             if has_file:
-                # Preferir parquet si existe
-                if parquet_name:
-                    parquet_path = family_path / parquet_name
-                    if parquet_path.exists():
-                        try:
-                            data[key] = pd.read_parquet(parquet_path)
-                            continue
-                        except Exception:
-                            pass
+                csv_path = family_path / csv_name
+                
+                # Preferir parquet procesado si está al día
+                df = self._load_processed(csv_path)
+                if df is not None:
+                    data[key] = df
+                    continue
                 
                 # Cargar CSV
-                csv_path = family_path / csv_name
                 if csv_path.exists():
                     result = loader.load_file(str(csv_path), file_type)
                     if result.success:
                         data[key] = result.dataframe
                         
-                        # Guardar parquet para próxima vez si es crawl master
-                        if file_type == FileType.CRAWL_MASTER and parquet_name:
-                            try:
-                                result.dataframe.to_parquet(family_path / parquet_name, index=False)
-                            except Exception:
-                                pass
+                        # Guardar parquet para próxima vez
+                        self._save_processed(result.dataframe, csv_path)
         
         return data
     
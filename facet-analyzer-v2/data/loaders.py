@@ -15,15 +15,28 @@ Archivos soportados:
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, Optional, Tuple, List, Any
+from typing import Dict, Optional, Tuple, List, Any, IO, Union
 from dataclasses import dataclass, field
 from enum import Enum
+import io
 import re
 import warnings
 
 # Suprimir warnings de pandas
 warnings.filterwarnings('ignore', category=pd.errors.DtypeWarning)
 
+# CSVs mayores que esto se leen por bloques de filas (acota la memoria del parser)
+LARGE_CSV_BYTES = 200 << 20
+CSV_CHUNK_ROWS = 200_000
+
+# Columnas de texto con menos valores distintos que esta fracción de filas pasan a category
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Columnas de crawls de Screaming Frog que usa el análisis (además de las seoFilterWrapper_*);
+# el resto de columnas del export no se llegan a parsear
+CRAWL_BASE_COLUMNS = ['Dirección', 'Código de respuesta', 'Nivel de profundidad']
+CRAWL_GSC_COLUMNS = ['Clics', 'Impresiones', 'Posición', 'CTR']
+
 # Streamlit es opcional
 try:
     import streamlit as st
@@ -180,6 +193,36 @@ class FileTypeDetector:
         return FileType.UNKNOWN
 
 
+def _normalize_status_codes(values: pd.Series) -> pd.Series:
+    """
+    Códigos de respuesta como enteros compactos (int16 para códigos HTTP)
+    Valores no numéricos pasan a 0
+    """
+    codes = pd.to_numeric(values, errors='coerce').fillna(0).astype(int)
+    info = np.iinfo(np.int16)
+    if len(codes) == 0 or (codes.min() >= info.min and codes.max() <= info.max):
+        codes = codes.astype(np.int16)
+    return codes
+
+
+def _compact_columns(df: pd.DataFrame, category_cols: List[str] = (),
+                     integer_cols: List[str] = ()) -> pd.DataFrame:
+    """
+    Reduce la memoria de columnas repetitivas (category) y de enteros pequeños (downcast)
+    Solo toca columnas existentes y del tipo esperado
+    """
+    for col in category_cols:
+        values = df[col]
+        if pd.api.types.is_string_dtype(values) and values.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(values):
+            df[col] = values.astype('category')
+    
+    for col in integer_cols:
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    return df
+
+
 class DataLoader:
     """
     Cargador de datos unificado con auto-detección
@@ -188,6 +231,9 @@ class DataLoader:
     
     ADOBE_SKIP_ROWS_OPTIONS = [0, 13, 14, 15]
     
+    # Filas leídas al sondear la cabecera de un archivo (no el archivo entero)
+    PROBE_ROWS = 50
+    
     def __init__(self, data_dir: str = None):
         """
         Inicializa el cargador
@@ -200,10 +246,17 @@ class DataLoader:
         self.load_results: Dict[str, LoadResult] = {}
         self.stats: DatasetStats = DatasetStats()
     
-    def _try_load_csv(self, filepath: Path, skip_rows: int = 0) -> Tuple[Optional[pd.DataFrame], str]:
+    def _try_load_csv(self, filepath: Path, skip_rows: int = 0,
+                      nrows: int = None, chunksize: int = None,
+                      usecols: List[int] = None) -> Tuple[Optional[pd.DataFrame], str]:
         """
         Intenta cargar un CSV con diferentes encodings
         
+        Args:
+            nrows: Leer solo las primeras filas (sondeos de cabecera)
+            chunksize: Leer por bloques de filas (mismo resultado que de una vez)
+            usecols: Posiciones de las columnas a parsear (None = todas)
+        
         Returns:
             (DataFrame o None, mensaje de error)
         """
@@ -212,13 +265,21 @@ class DataLoader:
         
         for encoding in encodings:
             try:
-                df = pd.read_csv(
-                    filepath, 
-                    skiprows=skip_rows,
-                    encoding=encoding, 
-                    low_memory=False,
-                    on_bad_lines='skip'
-                )
+                _rewind(filepath)
+                df = None
+                if chunksize:
+                    df = self._read_csv_chunked(filepath, skip_rows, encoding, chunksize, usecols)
+                if df is None:
+                    _rewind(filepath)
+                    df = pd.read_csv(
+                        filepath, 
+                        skiprows=skip_rows,
+                        encoding=encoding, 
+                        low_memory=False,
+                        on_bad_lines='skip',
+                        nrows=nrows,
+                        usecols=usecols
+                    )
                 if len(df) > 0 and len(df.columns) > 0:
                     return df, ""
             except Exception as e:
@@ -227,6 +288,78 @@ class DataLoader:
         
         return None, f"No se pudo cargar: {last_error}"
     
+    @staticmethod
+    def _read_csv_chunked(filepath: Path, skip_rows: int, encoding: str,
+                          chunksize: int, usecols: List[int] = None) -> Optional[pd.DataFrame]:
+        """
+        Lee un CSV por bloques de filas y los concatena
+        
+        Tipos distintos entre bloques se reconcilian sin releer el archivo:
+        pd.concat une los numéricos (enteros y bloques vacíos -> float64) y las
+        columnas que son texto solo en algunos bloques se releen aparte como texto,
+        igual que en una lectura completa
+        """
+        _rewind(filepath)
+        chunks = list(pd.read_csv(
+            filepath,
+            skiprows=skip_rows,
+            encoding=encoding,
+            low_memory=False,
+            on_bad_lines='skip',
+            chunksize=chunksize,
+            usecols=usecols
+        ))
+        if not chunks:
+            return None
+        
+        positions = sorted(usecols) if usecols is not None else range(len(chunks[0].columns))
+        text_cols = [
+            i for i, col in enumerate(chunks[0].columns)
+            if len({chunk[col].dtype for chunk in chunks}) > 1
+            and any(pd.api.types.is_string_dtype(chunk[col]) for chunk in chunks)
+        ]
+        df = pd.concat(chunks, ignore_index=True)
+        del chunks
+        
+        if text_cols:
+            _rewind(filepath)
+            text = pd.read_csv(
+                filepath,
+                skiprows=skip_rows,
+                encoding=encoding,
+                low_memory=False,
+                on_bad_lines='skip',
+                usecols=[positions[i] for i in text_cols],
+                dtype=str
+            )
+            if len(text) != len(df):
+                return None
+            for i, col in zip(text_cols, text.columns):
+                df.isetitem(i, text[col].values)
+        
+        return df
+    
+    @staticmethod
+    def _analysis_columns(columns: List[str], file_type: FileType) -> Optional[List[int]]:
+        """
+        Posiciones de las columnas de un crawl de Screaming Frog que usa el análisis
+        
+        Returns:
+            Lista de posiciones, o None si no hay nada que descartar (u otro tipo de archivo)
+        """
+        if file_type not in (FileType.CRAWL_MASTER, FileType.CRAWL_HISTORICAL, FileType.CRAWL_SF_GSC):
+            return None
+        if 'Dirección' not in columns:
+            return None
+        
+        keep = set(CRAWL_BASE_COLUMNS)
+        if file_type == FileType.CRAWL_SF_GSC:
+            keep.update(CRAWL_GSC_COLUMNS)
+        
+        positions = [i for i, c in enumerate(columns)
+                     if c in keep or 'seofilterwrapper' in str(c).lower()]
+        return positions if len(positions) < len(columns) else None
+    
     def _auto_detect_skip_rows(self, filepath: Path) -> int:
         """
         Auto-detecta si un archivo tiene cabeceras de Adobe Analytics
@@ -239,12 +372,10 @@ class DataLoader:
         """
         # Leer primeras 25 filas sin parsear
         try:
-            with open(filepath, 'r', encoding='utf-8-sig', errors='ignore') as f:
-                lines = [f.readline().strip() for _ in range(25)]
+            lines = _head_lines(filepath, 'utf-8-sig', 25)
         except:
             try:
-                with open(filepath, 'r', encoding='latin-1', errors='ignore') as f:
-                    lines = [f.readline().strip() for _ in range(25)]
+                lines = _head_lines(filepath, 'latin-1', 25)
             except:
                 return 0
         
@@ -278,7 +409,7 @@ class DataLoader:
         auto_skip = self._auto_detect_skip_rows(filepath)
         if auto_skip > 0:
             # Verificar que la auto-detección es correcta
-            df, _ = self._try_load_csv(filepath, skip_rows=auto_skip)
+            df, _ = self._try_load_csv(filepath, skip_rows=auto_skip, nrows=self.PROBE_ROWS)
             if df is not None and len(df.columns) > 1:
                 first_col = str(df.columns[0]).lower()
                 if any(x in first_col for x in ['url', 'page', 'filter', 'entry', 'search']):
@@ -286,7 +417,7 @@ class DataLoader:
         
         # Fallback: probar valores conocidos de Adobe Analytics
         for skip in self.ADOBE_SKIP_ROWS_OPTIONS:
-            df, _ = self._try_load_csv(filepath, skip_rows=skip)
+            df, _ = self._try_load_csv(filepath, skip_rows=skip, nrows=self.PROBE_ROWS)
             if df is not None and len(df.columns) > 1:
                 first_col = str(df.columns[0]).lower()
                 if any(x in first_col for x in ['url', 'page', 'filter', 'entry', 'search']):
@@ -299,29 +430,39 @@ class DataLoader:
         # Si nada funciona, devolver 0 (sin skip)
         return 0
     
-    def load_file(self, filepath: str, file_type: FileType = None, original_filename: str = None) -> LoadResult:
+    def load_file(self, filepath: Union[str, Path, IO[bytes]], file_type: FileType = None,
+                  original_filename: str = None, chunksize: int = None) -> LoadResult:
         """
         Carga un archivo con auto-detección de tipo
         
         Args:
-            filepath: Ruta al archivo
+            filepath: Ruta al archivo, o buffer binario con su contenido
+                (p.ej. un archivo subido, sin volcarlo a disco)
             file_type: Tipo de archivo (opcional, se auto-detecta)
             original_filename: Nombre original del archivo (para detección por nombre)
+            chunksize: Filas por bloque al leer el CSV (por defecto solo en archivos grandes)
         
         Returns:
             LoadResult con el DataFrame y metadatos
         """
-        path = Path(filepath)
-        
-        if not path.exists():
-            return LoadResult(
-                success=False,
-                file_type=FileType.UNKNOWN,
-                error=f"Archivo no encontrado: {filepath}"
-            )
+        if hasattr(filepath, 'read'):
+            path = filepath
+            size = _buffer_size(filepath)
+            default_name = Path(getattr(filepath, 'name', '') or '').name
+        else:
+            path = Path(filepath)
+            
+            if not path.exists():
+                return LoadResult(
+                    success=False,
+                    file_type=FileType.UNKNOWN,
+                    error=f"Archivo no encontrado: {filepath}"
+                )
+            size = path.stat().st_size
+            default_name = path.name
         
         # Usar nombre original si se proporciona, si no usar el de la ruta
-        filename = original_filename if original_filename else path.name
+        filename = original_filename if original_filename else default_name
         load_warnings = []
         
         # Determinar skiprows para archivos con cabeceras especiales
@@ -354,8 +495,24 @@ class DataLoader:
             skip_rows = 2
             load_warnings.append("Detectadas 2 filas de cabecera Keyword Planner")
         
-        # Cargar CSV
-        df, error = self._try_load_csv(path, skip_rows=skip_rows)
+        # Sondear cabecera y primeras filas: el tipo se decide antes de la lectura completa
+        usecols = None
+        probe, _ = self._try_load_csv(path, skip_rows=skip_rows, nrows=self.PROBE_ROWS)
+        if probe is not None:
+            if file_type is None:
+                file_type = FileTypeDetector.detect(probe, filename)
+            
+            # En crawls solo se parsean las columnas que usa el análisis
+            usecols = self._analysis_columns(probe.columns.tolist(), file_type)
+            if usecols is not None:
+                load_warnings.append(
+                    f"Descartadas {len(probe.columns) - len(usecols)} columnas del crawl no usadas en el análisis"
+                )
+        
+        # Cargar CSV (por bloques si es grande)
+        if chunksize is None and size > LARGE_CSV_BYTES:
+            chunksize = CSV_CHUNK_ROWS
+        df, error = self._try_load_csv(path, skip_rows=skip_rows, chunksize=chunksize, usecols=usecols)
         
         if df is None:
             return LoadResult(
@@ -364,7 +521,7 @@ class DataLoader:
                 error=error
             )
         
-        # Auto-detectar tipo si no se especificó
+        # Auto-detectar tipo si no se especificó (ni se pudo sondear)
         if file_type is None:
             file_type = FileTypeDetector.detect(df, filename)
         
@@ -429,7 +586,7 @@ class DataLoader:
                             count += 1
                 return count
             
-            df['wrapper_link_count'] = df.apply(count_wrapper_links, axis=1)
+            df['wrapper_link_count'] = df.apply(count_wrapper_links, axis=1).astype(np.int32)
             df['has_wrapper'] = df['wrapper_link_count'] > 0
         else:
             warnings_list.append("No se encontraron columnas seoFilterWrapper_hrefs")
@@ -443,9 +600,10 @@ class DataLoader:
         
         # Normalizar código de respuesta
         if 'Código de respuesta' in df.columns:
-            df['Código de respuesta'] = pd.to_numeric(
-                df['Código de respuesta'], errors='coerce'
-            ).fillna(0).astype(int)
+            df['Código de respuesta'] = _normalize_status_codes(df['Código de respuesta'])
+        
+        # Los hrefs del wrapper se repiten entre páginas: category en vez de texto por fila
+        _compact_columns(df, category_cols=href_cols + exists_cols, integer_cols=['Nivel de profundidad'])
         
         return df, warnings_list
     
@@ -461,9 +619,7 @@ class DataLoader:
                 df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
         
         if 'Código de respuesta' in df.columns:
-            df['Código de respuesta'] = pd.to_numeric(
-                df['Código de respuesta'], errors='coerce'
-            ).fillna(0).astype(int)
+            df['Código de respuesta'] = _normalize_status_codes(df['Código de respuesta'])
         
         # Añadir columnas de wrapper si no existen
         if 'wrapper_link_count' not in df.columns:
@@ -477,9 +633,7 @@ class DataLoader:
         warnings_list = []
         
         if 'Código de respuesta' in df.columns:
-            df['Código de respuesta'] = pd.to_numeric(
-                df['Código de respuesta'], errors='coerce'
-            ).fillna(0).astype(int)
+            df['Código de respuesta'] = _normalize_status_codes(df['Código de respuesta'])
         
         href_cols = [c for c in df.columns if 'seofilterwrapper_hrefs' in str(c).lower()]
         if href_cols:
@@ -604,6 +758,7 @@ class DataLoader:
             parsed = df['filter_name'].apply(parse_filter)
             df['facet_type'] = parsed.apply(lambda x: x['facet_type'])
             df['facet_value'] = parsed.apply(lambda x: x['facet_value'])
+            _compact_columns(df, category_cols=['facet_type'])
             
             df = df[df['filter_name'].notna() & (df['filter_name'] != '') & (df['filter_name'].astype(str) != 'nan')]
         
@@ -674,7 +829,9 @@ class DataLoader:
                 except:
                     return 0
             
-            df['volume'] = df['volume'].apply(parse_volume)
+            # Los rangos de Keyword Planner se repiten mucho: parsear solo valores únicos
+            volume_lookup = {v: parse_volume(v) for v in df['volume'].unique()}
+            df['volume'] = df['volume'].map(volume_lookup).astype('int64')
         
         if 'competition' in df.columns:
             competition_map = {
@@ -742,16 +899,16 @@ class DataLoader:
         
         crawl = self.get_crawl()
         if crawl is not None and 'Código de respuesta' in crawl.columns:
-            stats.total_urls = len(crawl)
-            stats.urls_200 = len(crawl[crawl['Código de respuesta'] == 200])
-            stats.urls_404 = len(crawl[crawl['Código de respuesta'] == 404])
-            stats.urls_301 = len(crawl[crawl['Código de respuesta'] == 301])
+            summary = summarize_crawl_status(crawl)
+            stats.total_urls = summary['total_urls']
+            stats.urls_200 = summary['urls_200']
+            stats.urls_404 = summary['urls_404']
+            stats.urls_301 = summary['urls_301']
             stats.urls_other = stats.total_urls - stats.urls_200 - stats.urls_404 - stats.urls_301
             
             if 'has_wrapper' in crawl.columns:
-                crawl_200 = crawl[crawl['Código de respuesta'] == 200]
-                stats.with_wrapper = len(crawl_200[crawl_200['has_wrapper'] == True])
-                stats.without_wrapper = len(crawl_200[crawl_200['has_wrapper'] == False])
+                stats.with_wrapper = summary['with_wrapper']
+                stats.without_wrapper = summary['without_wrapper']
         
         adobe_urls = self.get_adobe_urls()
         if adobe_urls is not None and 'visits_seo' in adobe_urls.columns:
@@ -793,6 +950,38 @@ class DataLoader:
         return merged
 
 
+def summarize_crawl_status(crawl: pd.DataFrame) -> Dict[str, int]:
+    """
+    Conteos del crawl por código de respuesta y wrapper, sin filtrar copias del DataFrame
+    
+    Los conteos por código solo se incluyen si existe 'Código de respuesta';
+    los de wrapper, si existe 'has_wrapper' (sobre URLs 200, o todas si no hay código).
+    """
+    summary = {'total_urls': len(crawl)}
+    has_status = 'Código de respuesta' in crawl.columns
+    
+    if has_status:
+        status = crawl['Código de respuesta']
+        counts = status.value_counts()
+        for code in (200, 404, 301):
+            summary[f'urls_{code}'] = int(counts.get(code, 0))
+        is_200 = (status == 200).to_numpy(dtype=bool)
+    else:
+        is_200 = np.ones(len(crawl), dtype=bool)
+    
+    if 'has_wrapper' in crawl.columns:
+        wrapper = crawl['has_wrapper']
+        with_wrapper = int(np.count_nonzero(is_200 & (wrapper == True).to_numpy(dtype=bool)))
+        summary['with_wrapper'] = with_wrapper
+        if pd.api.types.is_bool_dtype(wrapper) and not wrapper.hasnans:
+            # Booleano sin nulos: el resto de URLs 200 no tienen wrapper
+            summary['without_wrapper'] = summary.get('urls_200', len(crawl)) - with_wrapper
+        else:
+            summary['without_wrapper'] = int(np.count_nonzero(is_200 & (wrapper == False).to_numpy(dtype=bool)))
+    
+    return summary
+
+
 def validate_data_integrity(data: Dict[str, pd.DataFrame], expected_metrics: Dict = None) -> Dict[str, Any]:
     """
     Valida integridad de datos cargados
@@ -811,9 +1000,10 @@ def validate_data_integrity(data: Dict[str, pd.DataFrame], expected_metrics: Dic
             break
     
     if crawl is not None:
-        actual_total = len(crawl)
-        actual_200 = len(crawl[crawl['Código de respuesta'] == 200]) if 'Código de respuesta' in crawl.columns else 0
-        actual_404 = len(crawl[crawl['Código de respuesta'] == 404]) if 'Código de respuesta' in crawl.columns else 0
+        summary = summarize_crawl_status(crawl)
+        actual_total = summary['total_urls']
+        actual_200 = summary.get('urls_200', 0)
+        actual_404 = summary.get('urls_404', 0)
         
         results['stats'] = {
             'total_urls': actual_total,
@@ -834,6 +1024,37 @@ def validate_data_integrity(data: Dict[str, pd.DataFrame], expected_metrics: Dic
     return results
 
 
+def _rewind(source) -> None:
+    """Vuelve al inicio si la fuente es un buffer (cada lectura parte de cero)"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _buffer_size(buffer) -> int:
+    """Tamaño en bytes de un buffer sin leerlo"""
+    if hasattr(buffer, 'getbuffer'):
+        return buffer.getbuffer().nbytes
+    position = buffer.tell()
+    size = buffer.seek(0, io.SEEK_END)
+    buffer.seek(position)
+    return size
+
+
+def _head_lines(source, encoding: str, n: int) -> List[str]:
+    """Primeras n líneas (sin espacios) de una ruta o de un buffer binario"""
+    if not hasattr(source, 'read'):
+        with open(source, 'r', encoding=encoding, errors='ignore') as f:
+            return [f.readline().strip() for _ in range(n)]
+    
+    _rewind(source)
+    text = io.TextIOWrapper(source, encoding=encoding, errors='ignore')
+    try:
+        return [text.readline().strip() for _ in range(n)]
+    finally:
+        # Soltar el buffer sin cerrarlo
+        text.detach()
+
+
 def render_file_upload_ui() -> Dict[str, LoadResult]:
     """Renderiza UI para subir y detectar tipos de archivos"""
     if not HAS_STREAMLIT:
@@ -864,14 +1085,8 @@ def render_file_upload_ui() -> Dict[str, LoadResult]:
         loader = DataLoader()
         
         for uploaded_file in uploaded_files:
-            import tempfile
-            import os
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp:
-                tmp.write(uploaded_file.getvalue())
-                tmp_path = tmp.name
-            
-            result = loader.load_file(tmp_path)
+            # Leer directamente del buffer subido, sin pasar por disco
+            result = loader.load_file(uploaded_file, original_filename=uploaded_file.name)
             results[uploaded_file.name] = result
             
             if result.success:
@@ -881,7 +1096,5 @@ def render_file_upload_ui() -> Dict[str, LoadResult]:
                         st.caption(f"⚠️ {w}")
             else:
                 st.error(f"❌ **{uploaded_file.name}**: {result.error}")
-            
-            os.unlink(tmp_path)
     
     return results
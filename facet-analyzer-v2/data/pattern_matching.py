@@ -0,0 +1,191 @@
+"""
+Matching de patrones en bloque - v2.3
+Calcula de una vez las coincidencias de muchos patrones sobre una columna
+"""
+
+import os
+import re
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Caracteres con significado especial en una regex
+_REGEX_METACHARS = frozenset('.^$*+?{}[]\\|()')
+
+# Filas por bloque al agregar: acota la matriz de coincidencias en memoria
+CHUNK_ROWS = 1 << 17
+
+# Hilos para evaluar regex en paralelo (Arrow libera el GIL durante la búsqueda)
+MAX_WORKERS = os.cpu_count() or 1
+
+
+@lru_cache(maxsize=512)
+def compile_pattern(pattern: str, case: bool = False) -> Optional[re.Pattern]:
+    """Compila y memoriza un patrón; None si no es una regex válida"""
+    try:
+        return re.compile(pattern, 0 if case else re.IGNORECASE)
+    except (re.error, TypeError):
+        return None
+
+
+def is_literal_pattern(pattern: str) -> bool:
+    """True si el patrón es un texto ASCII sin metacaracteres (búsqueda de subcadena)"""
+    return (isinstance(pattern, str) and bool(pattern) and pattern.isascii()
+            and not any(c in _REGEX_METACHARS for c in pattern))
+
+
+def _lowered_values(values: pd.Series) -> List[str]:
+    """Valores en minúsculas; los que no son texto se convierten en cadena vacía"""
+    return [v.lower() if isinstance(v, str) else '' for v in values.to_numpy(dtype=object)]
+
+
+def _arrow_strings(values: pd.Series):
+    """
+    Columna de texto como array Arrow, o None si no aplica
+
+    Solo se convierten las columnas object: las de tipo str de pandas ya
+    buscan sobre Arrow. Columnas con valores que no son texto devuelven None.
+    """
+    if not HAS_PYARROW or values.dtype != object:
+        return None
+    try:
+        return pa.array(values.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def _match_arrow(arrow_values, pattern: str, case: bool) -> Optional[np.ndarray]:
+    """Regex nativa (RE2) de Arrow; None si el patrón usa sintaxis que RE2 no admite"""
+    try:
+        matched = pc.match_substring_regex(arrow_values, pattern, ignore_case=not case)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return None
+    return pc.fill_null(matched, False).to_numpy(zero_copy_only=False).astype(bool, copy=False)
+
+
+def match_pattern(values: pd.Series, pattern: str, case: bool = False) -> np.ndarray:
+    """
+    Máscara booleana de las filas que coinciden con un patrón
+
+    Las columnas object se evalúan con la regex de Arrow cuando el patrón lo
+    permite (p. ej. sin lookarounds); si no, con re.
+    """
+    if compile_pattern(pattern, case) is None or len(values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    return _match_one(values, pattern, case, _arrow_strings(values))
+
+
+def _match_one(values: pd.Series, pattern: str, case: bool, arrow_values) -> np.ndarray:
+    """match_pattern con la conversión a Arrow ya hecha (o None)"""
+    compiled = compile_pattern(pattern, case)
+    if compiled is None:
+        return np.zeros(len(values), dtype=bool)
+
+    if arrow_values is not None:
+        mask = _match_arrow(arrow_values, pattern, case)
+        if mask is not None:
+            return mask
+
+    try:
+        return values.str.contains(compiled, na=False, regex=True).to_numpy(dtype=bool)
+    except Exception:
+        return np.zeros(len(values), dtype=bool)
+
+
+def match_patterns(values: pd.Series, patterns: Sequence[str], case: bool = False,
+                   cache: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """
+    Matriz booleana (filas x patrones) de coincidencias de cada patrón
+
+    Cada patrón se evalúa una sola vez sobre la columna aunque aparezca repetido.
+    Patrones inválidos o columnas sin texto no coinciden con ninguna fila.
+    Si se pasa `cache`, las máscaras se reutilizan entre llamadas sobre la misma columna.
+    Los patrones literales sin distinguir mayúsculas se resuelven como búsqueda de
+    subcadena sobre la columna en minúsculas (calculada una sola vez), sin pasar por re.
+    El resto de patrones se reparte entre hilos cuando la columna está en Arrow y
+    hay más de un núcleo.
+    """
+    n_rows = len(values)
+    matrix = np.zeros((n_rows, len(patterns)), dtype=bool)
+
+    if n_rows == 0:
+        return matrix
+
+    computed = cache if cache is not None else {}
+    lowered = None
+    pending = []
+    for pattern in dict.fromkeys(patterns):
+        if pattern in computed:
+            continue
+        if not case and is_literal_pattern(pattern):
+            if lowered is None:
+                lowered = _lowered_values(values)
+            needle = pattern.lower()
+            computed[pattern] = np.fromiter((needle in v for v in lowered), dtype=bool, count=n_rows)
+        else:
+            pending.append(pattern)
+
+    if pending:
+        arrow_values = _arrow_strings(values)
+        native = arrow_values is not None or values.dtype != object
+
+        def match(pattern: str) -> np.ndarray:
+            return _match_one(values, pattern, case, arrow_values)
+
+        if native and MAX_WORKERS > 1 and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pending))) as executor:
+                masks = list(executor.map(match, pending))
+        else:
+            masks = [match(pattern) for pattern in pending]
+        computed.update(zip(pending, masks))
+
+    for j, pattern in enumerate(patterns):
+        matrix[:, j] = computed[pattern]
+
+    return matrix
+
+
+def sum_by_patterns(matrix: np.ndarray, values) -> np.ndarray:
+    """Suma de `values` en las filas que coinciden con cada patrón (sin copiar filas)"""
+    if isinstance(values, np.ndarray) and values.dtype == np.float64:
+        weights = values
+    else:
+        weights = pd.to_numeric(pd.Series(values), errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    return weights @ matrix
+
+
+def count_by_patterns(matrix: np.ndarray, row_mask: np.ndarray = None) -> np.ndarray:
+    """Número de filas que coinciden con cada patrón (opcionalmente solo en `row_mask`)"""
+    if row_mask is not None:
+        matrix = matrix[row_mask]
+    return np.count_nonzero(matrix, axis=0)
+
+
+def aggregate_by_patterns(values: pd.Series, patterns: Sequence[str],
+                          weights: Dict[str, np.ndarray], case: bool = False,
+                          chunk_rows: int = CHUNK_ROWS) -> Dict[str, np.ndarray]:
+    """
+    Suma cada vector de `weights` sobre las filas que coinciden con cada patrón
+
+    La columna se procesa por bloques de `chunk_rows` filas, de modo que la matriz
+    de coincidencias nunca supera chunk_rows x patrones aunque la fuente tenga
+    millones de filas. Para contar filas basta con pasar un vector de unos.
+    """
+    totals = {key: np.zeros(len(patterns)) for key in weights}
+
+    for start in range(0, len(values), chunk_rows):
+        rows = slice(start, start + chunk_rows)
+        block = match_patterns(values.iloc[rows], patterns, case)
+        for key, w in weights.items():
+            totals[key] += sum_by_patterns(block, w[rows])
+
+    return totals
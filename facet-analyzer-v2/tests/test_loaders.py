@@ -0,0 +1,66 @@
+"""
+Tests de carga de CSV
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from data.loaders import DataLoader, FileType
+
+
+def _write_mixed_keywords(path: Path, rows: int) -> None:
+    """Keywords numéricas salvo la última (columna de tipo mixto)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Keyword,Volume\n')
+        f.writelines(f'{i:04d},{i % 100}\n' for i in range(rows - 1))
+        f.write('abc,5\n')
+
+
+def _write_sparse_clicks(path: Path, rows: int, empty: int) -> None:
+    """Crawl con GSC cuya columna Clics está vacía en las primeras filas"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Dirección,Código de respuesta,Nivel de profundidad,Clics,Impresiones,Posición,CTR\n')
+        f.writelines(
+            f'https://example.com/p/{i},200,{i % 5},{"" if i < empty else i % 50},{i},1.5,2%\n'
+            for i in range(rows)
+        )
+
+
+def _assert_chunked_matches(path: Path, file_type: FileType, chunksize: int) -> pd.DataFrame:
+    chunked = DataLoader().load_file(str(path), file_type, chunksize=chunksize)
+    single = DataLoader().load_file(str(path), file_type)
+    
+    assert chunked.success and single.success
+    pd.testing.assert_frame_equal(chunked.dataframe, single.dataframe)
+    return chunked.dataframe
+
+
+def test_chunked_read_matches_single_pass_on_mixed_column(tmp_path):
+    path = tmp_path / 'semrush.csv'
+    _write_mixed_keywords(path, 300_000)
+    
+    # Un único bloque mayor que el buffer interno del parser
+    df = _assert_chunked_matches(path, FileType.SEMRUSH, chunksize=400_000)
+    assert all(isinstance(v, str) for v in df['keyword'])
+
+
+def test_chunked_read_rereads_text_columns_as_text(tmp_path):
+    path = tmp_path / 'semrush.csv'
+    _write_mixed_keywords(path, 1_000)
+    
+    # Solo el último bloque ve texto: la columna se relee como texto (ceros a la izquierda incluidos)
+    df = _assert_chunked_matches(path, FileType.SEMRUSH, chunksize=300)
+    assert df['keyword'].iloc[7] == '0007'
+
+
+def test_chunked_read_reconciles_numeric_columns(tmp_path):
+    path = tmp_path / 'gsc_crawl.csv'
+    _write_sparse_clicks(path, 1_000, empty=400)
+    
+    # Bloques vacíos (float64) y con enteros (int64) se unen como en una lectura completa
+    df = _assert_chunked_matches(path, FileType.CRAWL_SF_GSC, chunksize=300)
+    assert df['Clics'].iloc[:400].eq(0).all()
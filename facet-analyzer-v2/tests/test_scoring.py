@@ -0,0 +1,51 @@
+"""
+Tests del scoring de facetas
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis.scoring import FacetScorer, scores_to_dataframe
+
+
+def _facets(n: int):
+    rng = random.Random(0)
+    values = [0, 1, 5, 10, 50, 99, 100, 999, 1000, 3000, 10000, 50000, 200000]
+    return [
+        {
+            'facet_name': f'f{i}',
+            'demand': rng.choice(values + [rng.randint(0, 200000)]),
+            'traffic': rng.choice(values + [rng.randint(0, 200000)]),
+            'urls_200': rng.choice([0, 1, 5, 10, 50, 200]),
+            'urls_404': rng.choice([0, 1, 9, 10, 49, 50, 100]),
+            'in_wrapper': rng.random() < 0.5,
+        }
+        for i in range(n)
+    ]
+
+
+def test_scores_csv_matches_per_facet_scoring():
+    scorer = FacetScorer()
+    facets = _facets(2000)
+    
+    # Referencia: una faceta cada vez y to_dict (round() de Python)
+    expected = sorted((scorer.score_facet(**data) for data in facets),
+                      key=lambda s: s.total_score, reverse=True)
+    expected_csv = pd.DataFrame([s.to_dict() for s in expected]).to_csv(index=False)
+    
+    scores = scorer.score_multiple(facets)
+    assert scores_to_dataframe(scores).to_csv(index=False) == expected_csv
+    assert scores_to_dataframe(scorer.score_table(facets)).to_csv(index=False) == expected_csv
+
+
+def test_band_scores_stay_integer():
+    scorer = FacetScorer()
+    score = scorer.score_multiple(_facets(50))[0]
+    
+    assert isinstance(score.demand_score, int)
+    assert isinstance(score.opportunity_score, int)